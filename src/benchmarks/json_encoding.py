@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import timeit
+
+from fastapi.encoders import jsonable_encoder
+
+from services.snapshot import DEFAULT_SNAPSHOT_PATH, SnapshotError, load_snapshot
+from utils.fast_json import dumps
+
+# compara o caminho padrão do FastAPI (jsonable_encoder + json.dumps) com o
+# orjson usado pelo FastJSONResponse nos maiores payloads da API:
+#   python -m benchmarks.json_encoding --snapshot swapi_snapshot.bin
+
+
+def _fastapi_default(content) -> bytes:
+    # o que o JSONResponse faz depois do jsonable_encoder
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode()
+
+
+def _synthetic_dataset(scale: int) -> dict[str, list[dict]]:
+    # formato do swapi, usado quando não há snapshot disponível
+    crawl = "It is a period of civil war. Rebel spaceships, striking\r\nfrom a hidden base, " * 12
+    people = [
+        {
+            "name": f"Person {i}", "height": str(150 + i % 60), "mass": str(50 + i % 70),
+            "hair_color": "brown", "skin_color": "fair", "eye_color": "blue",
+            "birth_year": f"{i}BBY", "gender": "male" if i % 2 else "female",
+            "homeworld": f"https://swapi.dev/api/planets/{i % 60 + 1}/",
+            "films": [f"https://swapi.dev/api/films/{f}/" for f in range(1, 4)],
+            "species": [], "vehicles": [], "starships": [],
+            "created": "2014-12-09T13:50:51.644000Z", "edited": "2014-12-20T21:17:56.891000Z",
+            "url": f"https://swapi.dev/api/people/{i}/",
+        }
+        for i in range(1, 83 * scale)
+    ]
+    films = [
+        {
+            "title": f"Episode {i}", "episode_id": i, "opening_crawl": crawl,
+            "director": "George Lucas", "producer": "Gary Kurtz, Rick McCallum",
+            "release_date": "1977-05-25",
+            "characters": [person["url"] for person in people[:40]],
+            "planets": [], "starships": [], "vehicles": [], "species": [],
+            "created": "2014-12-10T14:23:31.880000Z", "edited": "2014-12-20T19:49:45.256000Z",
+            "url": f"https://swapi.dev/api/films/{i}/",
+        }
+        for i in range(1, 7 * scale)
+    ]
+    return {"people": people, "films": films}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de serialização JSON das maiores respostas")
+    parser.add_argument("--snapshot", default=os.getenv("SWAPI_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH))
+    parser.add_argument("--scale", type=int, default=1, help="multiplica o dataset sintético")
+    parser.add_argument("--number", type=int, default=200, help="repetições por medição")
+    args = parser.parse_args()
+
+    try:
+        dataset = load_snapshot(args.snapshot)
+        print(f"dataset: snapshot {args.snapshot}")
+    except (OSError, SnapshotError):
+        dataset = _synthetic_dataset(args.scale)
+        print(f"dataset: sintético (escala {args.scale})")
+
+    for resource in ("films", "people"):
+        content = {"results": tuple(dataset.get(resource, ()))}
+        assert json.loads(_fastapi_default(content)) == json.loads(dumps(content))
+
+        default = timeit.timeit(lambda: _fastapi_default(content), number=args.number) / args.number
+        fast = timeit.timeit(lambda: dumps(content), number=args.number) / args.number
+        size = len(dumps(content))
+
+        print(
+            f"{resource:>8}: {len(content['results'])} registros, {size / 1024:.1f}KB | "
+            f"padrão {default * 1000:.3f}ms | orjson {fast * 1000:.3f}ms | {default / fast:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,14 @@
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Query
-from services.swapi_services import fetch_data, load_swapi_cache
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse
+from services.swapi_client import UpstreamUnavailable, close_swapi_client
+from services.dataset import current_dataset, pinned_dataset
+from services.swapi_services import SWAPI_RELOAD_INTERVAL, fetch_data, get_text_index, load_swapi_cache, revalidate_swapi_cache, run_periodic_reload
+from utils.etag import cache_control, etag_for, etag_matches, is_cacheable
+from utils.fast_json import FastJSONResponse
 from utils.filters import apply_filters
 from schemas.types_class import Types
 from routers.people import router as people_router
@@ -9,24 +17,80 @@ from routers.films import router as films_router
 from routers.starships import router as starships_router
 from routers.species import router as species_router
 from routers.vehicles import router as vehicles_router
+from routers.stats import router as stats_router
+from routers.metrics import router as metrics_router
+from routers.admin import router as admin_router
+from routers.export import router as export_router
+from routers.batch import router as batch_router
+from routers.graph import router as graph_router
+from routers.cooccurrence import router as cooccurrence_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🔹 Carregando cache da SWAPI...")
-    load_swapi_cache()
-    print("✅ Cache carregado com sucesso")
+    start = time.perf_counter()
+    await load_swapi_cache(os.getenv("SWAPI_SNAPSHOT_PATH"))
+    print(f"✅ Cache carregado com sucesso em {time.perf_counter() - start:.2f}s")
+
+    reload_task = None
+    if SWAPI_RELOAD_INTERVAL > 0:
+        reload_task = asyncio.create_task(run_periodic_reload(SWAPI_RELOAD_INTERVAL))
+
     yield
 
+    if reload_task is not None:
+        reload_task.cancel()
+    await close_swapi_client()
+
 
 app = FastAPI(
     title="Star Wars API",
     description="API para consulta de dados da saga Star Wars usando SWAPI",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse
 )
 
 
+# registrado antes do dataset_snapshot, então roda dentro dele, já com a geração fixada
+@app.middleware("http")
+async def conditional_get(request: Request, call_next):
+    if not is_cacheable(request.method, request.url.path):
+        return await call_next(request)
+
+    # os dados só mudam de uma geração para outra: conteúdo + rota + query identificam a resposta
+    etag = etag_for(
+        current_dataset().fingerprint,
+        request.url.path,
+        request.query_params.multi_items(),
+    )
+    headers = {"ETag": etag, "Cache-Control": cache_control()}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
+
+
+@app.middleware("http")
+async def dataset_snapshot(request: Request, call_next):
+    # dataset vencido: responde com os dados atuais e recarrega em background
+    revalidate_swapi_cache()
+
+    # a requisição inteira lê a geração que estava no ar quando ela chegou
+    with pinned_dataset():
+        return await call_next(request)
+
+
+@app.exception_handler(UpstreamUnavailable)
+async def upstream_unavailable_handler(request: Request, exc: UpstreamUnavailable):
+    return JSONResponse(status_code=503, content={"detail": "SWAPI indisponível no momento"})
+
+
 @app.get("/")
 def get_data(
     type: Types = Query(..., description="Tipo de recurso da SWAPI"),
@@ -42,12 +106,21 @@ def get_data(
         else: 
             filters["name"] = name
 
-    result = apply_filters(data, filters)
-    return {"results": result}
+    result = apply_filters(data, filters, get_text_index(type.value))
+
+    # registros crus do cache: serializa direto, sem jsonable_encoder
+    return FastJSONResponse({"results": result})
 
 app.include_router(people_router)
 app.include_router(planets_router)
 app.include_router(films_router)
 app.include_router(starships_router)
 app.include_router(species_router)
-app.include_router(vehicles_router)
\ No newline at end of file
+app.include_router(vehicles_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
+app.include_router(admin_router)
+app.include_router(export_router)
+app.include_router(batch_router)
+app.include_router(graph_router)
+app.include_router(cooccurrence_router)
\ No newline at end of file
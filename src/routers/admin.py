@@ -0,0 +1,35 @@
+import hmac
+import os
+
+from fastapi import APIRouter, Header, HTTPException
+
+from services.swapi_services import get_dataset_info, reload_swapi_cache
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+# as rotas de admin exigem o header X-Admin-Token; sem SWAPI_ADMIN_TOKEN
+# definido elas ficam desabilitadas (o reload refaz todas as chamadas ao swapi)
+ADMIN_TOKEN = os.getenv("SWAPI_ADMIN_TOKEN")
+
+
+def _check_token(token: str | None) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Rotas de admin desabilitadas: defina SWAPI_ADMIN_TOKEN")
+    if token is None or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Token de admin inválido")
+
+
+@router.get("/dataset")
+def dataset_info(x_admin_token: str | None = Header(None)):
+    _check_token(x_admin_token)
+    return get_dataset_info()
+
+
+@router.post("/reload")
+async def reload_dataset(x_admin_token: str | None = Header(None)):
+    # recarrega tudo do swapi e troca a geração de uma vez; as requisições em
+    # andamento terminam com a geração anterior
+    _check_token(x_admin_token)
+    dataset = await reload_swapi_cache()
+    return get_dataset_info(dataset)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Query
+
+from schemas.types_class import BatchUrlsRequest
+from services.batch import resolve_urls
+
+
+router = APIRouter(prefix="/batch", tags=["batch"])
+
+
+@router.get("")
+async def batch_by_urls(urls: list[str] = Query(..., description="Urls do swapi de qualquer recurso")):
+    return {"results": await resolve_urls(urls)}
+
+
+@router.post("")
+async def batch_by_urls_body(request: BatchUrlsRequest):
+    # mesma busca do GET, para listas grandes demais para a query string
+    return {"results": await resolve_urls(request.urls)}
@@ -0,0 +1,62 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from schemas.types_class import FilmMember
+from services.batch import parse_ids
+from services.swapi_services import fetch_data, get_cooccurrence, get_entity_graph
+
+
+router = APIRouter(prefix="/cooccurrence", tags=["cooccurrence"])
+
+
+def _ordinal(resource: str, id: int) -> int:
+    graph = get_entity_graph()
+    node = graph.node(resource, id)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"{resource}/{id} não encontrado")
+    return node - graph.offsets[resource]
+
+
+def _describe(resource: str, ordinal: int) -> dict:
+    graph = get_entity_graph()
+    return graph.describe(graph.offsets[resource] + ordinal)
+
+
+@router.get("/{type}/in-films")
+def in_all_films(
+    type: FilmMember,
+    films: str = Query(..., description="Ids dos filmes separados por vírgula (ex.: 1,2,3)")
+):
+    film_ordinals = [_ordinal("films", id) for id in parse_ids(films)]
+    ordinals = get_cooccurrence().in_all_films(type.value, film_ordinals)
+
+    return {
+        "films": [_describe("films", film) for film in film_ordinals],
+        "total": len(ordinals),
+        "results": [_describe(type.value, ordinal) for ordinal in ordinals],
+    }
+
+
+@router.get("/{type}/{id}/similar")
+def similar(
+    type: FilmMember,
+    id: int,
+    k: int = Query(10, ge=1, le=100, description="Quantidade de resultados")
+):
+    ordinal = _ordinal(type.value, id)
+    cooccurrence = get_cooccurrence()
+    films = fetch_data("films")
+
+    return {
+        "source": _describe(type.value, ordinal),
+        "results": [
+            {
+                **_describe(type.value, other),
+                "jaccard": round(score, 4),
+                "shared_films": [
+                    films[film]["title"]
+                    for film in cooccurrence.shared_films(type.value, ordinal, other)
+                ],
+            }
+            for other, score, _ in cooccurrence.similar(type.value, ordinal, k)
+        ],
+    }
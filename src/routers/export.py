@@ -0,0 +1,74 @@
+from typing import Iterator
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from schemas.types_class import Types
+from services.fragments import check_projection, get_fragment, sparse_record
+from services.swapi_services import fetch_data
+from utils.fast_json import dumps
+from utils.projection import parse_fields, project
+
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+def _complete(record: dict, item: dict, fields: set[str]) -> dict:
+    # campos pedidos que só existem no outro formato (created/edited/url do
+    # registro cru, url_id da resposta expandida): os dois modos devolvem os mesmos nomes
+    for field in fields - record.keys():
+        record[field] = item.get("url") if field == "url_id" else item.get(field)
+    return record
+
+
+def _ndjson_lines(
+    resource: str,
+    items: tuple[dict, ...],
+    name: str | None,
+    expand: bool,
+    fields: set[str] | None,
+) -> Iterator[bytes]:
+    # um registro por vez direto do cache: a memória por conexão não cresce com o resultado
+    key = "title" if resource == "films" else "name"
+
+    for item in items:
+        if name and name not in str(item.get(key, "")).lower():
+            continue
+
+        if fields is None:
+            line = get_fragment(resource, item) if expand else dumps(item)
+        else:
+            record = sparse_record(resource, item, fields, None) if expand else project(item, fields)
+            line = dumps(_complete(record, item, fields))
+
+        yield line + b"\n"
+
+
+@router.get("/{type}")
+def export_resource(
+    type: Types,
+    name: str | None = Query(None, description="Filtro por nome (title nos filmes)"),
+    expand: bool = Query(False, description="Expande as relações como nas listagens"),
+    fields: list[str] | None = Query(None, description="Campos a incluir (ex.: fields=name,height)")
+):
+    items = fetch_data(type.value)
+    projection = parse_fields(fields)
+
+    # os dois modos validam os mesmos nomes: chaves dos registros crus ou campos
+    # da resposta expandida; qualquer outro nome é 400
+    if projection:
+        raw_keys = set().union(*(item.keys() for item in items))
+        check_projection(type.value, projection - raw_keys, None)
+
+    lines = _ndjson_lines(
+        type.value,
+        items,
+        name.lower() if name else None,
+        expand,
+        projection,
+    )
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{type.value}.ndjson"'},
+    )
@@ -1,8 +1,18 @@
 from fastapi import APIRouter, Depends, Query
 
-from schemas.types_class import FilmWithCounts, FilmsResponse, FilmsRequest, FilmsWithCountsResponse, PaginatedFilmsResponse, People, Planets, Species, Starships, Vehicles
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_smart_filters
+from schemas.types_class import FilmWithCounts, FilmsResponse, FilmsRequest, FilmsWithCountsResponse, PaginatedFilmsResponse, People, Planets, SparsePaginatedResponse, Species, Starships, Vehicles
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.columns import range_filter_ordinals
+from utils.filter_expression import filter_expression_bits
+from utils.filters import smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import related_ordinals, relation_filter_ordinals
 
 
 router = APIRouter(prefix="/films", tags=["films"])
@@ -10,30 +20,61 @@ router = APIRouter(prefix="/films", tags=["films"])
 
 
 @router.get("/by-id/{id}")
-def get_films_by_id(id: int):
-    film_data = fetch_data_by_id("films", id)
+async def get_films_by_id(id: int):
+    film_data = await fetch_data_by_id("films", id)
     return film_data
 
 
 
+@router.get("/batch")
+async def get_films_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("films", parse_ids(ids))}
+
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_FILMS_EXPANDERS = {
+    "characters": lambda graph, item: [
+        People(name=person["name"])
+        for person in graph.related(item, "characters")
+    ],
+    "planets": lambda graph, item: [
+        Planets(name=planet["name"], population=planet["population"])
+        for planet in graph.related(item, "planets")
+    ],
+    "starships": lambda graph, item: [
+        Starships(
+            name=ship["name"],
+            model=ship["model"],
+            pilots=[pilot["name"] for pilot in graph.related(ship, "pilots")]
+        )
+        for ship in graph.related(item, "starships")
+    ],
+    "vehicles": lambda graph, item: [
+        Vehicles(name=vehicle["name"], model=vehicle["model"])
+        for vehicle in graph.related(item, "vehicles")
+    ],
+    "species": lambda graph, item: [
+        Species(name=specie["name"], classification=specie["classification"])
+        for specie in graph.related(item, "species")
+    ],
+}
+
+
+register_fragment_builder("films", FilmsResponse, _FILMS_EXPANDERS)
+
+
 @router.get(
     "/list_films_by_filters",
-    response_model=PaginatedFilmsResponse
+    response_model=PaginatedFilmsResponse | SparsePaginatedResponse
 )
+@cached_response
 def list_films_by_filters(request: FilmsRequest = Depends()):
 
-    films_data = fetch_data("films")
-    people_data = fetch_data("people")
-    species_data = fetch_data("species")
-    vehicles_data = fetch_data("vehicles")
-    starships_data = fetch_data("starships")
-    planets_data = fetch_data("planets")
-
-    people_map = {p["url"]: p for p in people_data}
-    species_map = {s["url"]: s for s in species_data}
-    vehicles_map = {v["url"]: v for v in vehicles_data}
-    starships_map = {s["url"]: s for s in starships_data}
-    planets_map = {p["url"]: p for p in planets_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("films", fields, expand)
+
+    graph = get_relation_graph()
 
     filters = {}
 
@@ -48,122 +89,27 @@ def list_films_by_filters(request: FilmsRequest = Depends()):
     if request.release_date:
         filters["release_date"] = request.release_date.isoformat()
 
-    result = (
-        films_data if not filters
-        else apply_smart_filters(films_data, filters)
-    )
+    matched = smart_filter_ordinals(get_text_index("films"), filters)
+    matched = range_filter_ordinals(get_numeric_columns("films"), request, matched)
+    matched = relation_filter_ordinals(graph, get_text_index, "films", request.related, matched)
 
     if request.name_people:
-        filtered = []
-        for f in result:
-            for url in f.get("characters", []):
-                if url in people_map and request.name_people.lower() in people_map[url]["name"].lower():
-                    filtered.append(f)
-                    break  
-        result = filtered
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
+        # filmes dos personagens encontrados, pelas listas reversas do grafo
+        in_films = related_ordinals(graph, get_text_index, "films", ("characters",), request.name_people.lower())
+        matched = in_films if matched is None else matched & in_films
 
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated = result[start:end]
+    matched = filter_expression_bits(request.filter, "films", current_dataset(), matched)
 
-    response: list[FilmsResponse] = []
+    total, paginated, next_cursor = paginate(get_ordering("films"), matched, request)
 
-    for f in paginated:
-
-        characters = [
-            People(name=people_map[url]["name"])
-            for url in f.get("characters", [])
-            if url in people_map
-        ]
-
-        planets = [
-            Planets(
-                name=planets_map[url]["name"],
-                population=planets_map[url]["population"]
-            )
-            for url in f.get("planets", [])
-            if url in planets_map
-        ]
-
-        starships = []
-        for url in f.get("starships", []):
-            if url not in starships_map:
-                continue
-
-            ship = starships_map[url]
-            pilots = [
-                people_map[pilot]["name"]
-                for pilot in ship.get("pilots", [])
-                if pilot in people_map
-            ]
-
-            starships.append(
-                Starships(
-                    name=ship["name"],
-                    model=ship["model"],
-                    pilots=pilots
-                )
-            )
-
-        vehicles = [
-            Vehicles(
-                name=vehicles_map[url]["name"],
-                model=vehicles_map[url]["model"]
-            )
-            for url in f.get("vehicles", [])
-            if url in vehicles_map
-        ]
-
-        species = [
-            Species(
-                name=species_map[url]["name"],
-                classification=species_map[url]["classification"]
-            )
-            for url in f.get("species", [])
-            if url in species_map
-        ]
-
-        response.append(
-            FilmsResponse(
-                title=f["title"],
-                episode_id=f["episode_id"],
-                opening_crawl=f["opening_crawl"],
-                director=f["director"],
-                producer=f["producer"],
-                release_date=f["release_date"],
-                characters=characters,
-                planets=planets,
-                starships=starships,
-                vehicles=vehicles,
-                species=species,
-                url_id=f["url"]
-            )
-        )
-
-    return PaginatedFilmsResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    return paginated_response("films", request.page, request.page_size, total, paginated, next_cursor, fields, expand)
 
 
 @router.get(
     "/list_with_counts",
     response_model=FilmsWithCountsResponse
 )
+@materialized_view
 def list_films_with_counts():
 
     films_data = fetch_data("films")
@@ -185,6 +131,7 @@ def list_films_with_counts():
 
 
 @router.get("/stats/overview")
+@materialized_view
 def films_stats_overview():
 
     films = fetch_data("films")
@@ -196,6 +143,7 @@ def films_stats_overview():
     }
 
 @router.get("/stats/movies_most_species")
+@materialized_view
 def movies_most_species():
 
     films = fetch_data("films")
@@ -216,6 +164,7 @@ def movies_most_species():
     }
 
 @router.get("/stats/starships_useds_in_movies")
+@materialized_view
 def starships_useds_in_movies():
 
     films = fetch_data("films")
@@ -236,6 +185,7 @@ def starships_useds_in_movies():
     }
 
 @router.get("/stats/timeline")
+@materialized_view
 def films_timeline_stats():
 
     films = fetch_data("films")
@@ -0,0 +1,86 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from services.batch import parse_url
+from services.dataset import RESOURCES
+from services.entity_graph import EntityGraph
+from services.relations import resource_chain
+from services.swapi_services import get_entity_graph
+
+
+router = APIRouter(prefix="/graph", tags=["graph"])
+
+
+def _entity_node(graph: EntityGraph, value: str) -> int:
+    # aceita "people/1" ou a url completa do swapi
+    target = parse_url(value)
+    if target is None:
+        raise HTTPException(status_code=400, detail=f"entidade inválida: {value} (use recurso/id, ex.: people/1)")
+
+    node = graph.node(*target)
+    if node is None:
+        raise HTTPException(status_code=404, detail=f"entidade não encontrada: {value}")
+    return node
+
+
+def _parse_path(path: str) -> tuple[str, ...]:
+    # starships.pilots.homeworld ou starships -> pilots -> homeworld
+    fields = tuple(field.strip() for field in path.replace("->", ".").split("."))
+    if not all(fields):
+        raise HTTPException(status_code=400, detail="caminho inválido")
+    return fields
+
+
+@router.get("/traverse")
+def traverse(
+    start: str = Query(..., description="Entidade inicial (ex.: people/1)"),
+    path: str = Query(..., description="Relações a seguir (ex.: starships.pilots.homeworld)")
+):
+    graph = get_entity_graph()
+    node = _entity_node(graph, start)
+    fields = _parse_path(path)
+
+    try:
+        chain = resource_chain(graph.resource_of(node), fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    nodes = [node]
+    hops = []
+    for field, resource in zip(fields, chain[1:]):
+        nodes = graph.follow(nodes, field)
+        hops.append({"relation": field, "type": resource, "count": len(nodes)})
+
+    return {
+        "start": graph.describe(node),
+        "hops": hops,
+        "results": [graph.describe(n) for n in nodes],
+    }
+
+
+@router.get("/shortest-path")
+def shortest_path(
+    source: str = Query(..., description="Entidade de origem (ex.: people/1)"),
+    target: str = Query(..., description="Entidade de destino (ex.: planets/8)"),
+    via: str | None = Query(None, description="Recursos permitidos no caminho (ex.: films,people,planets,starships)")
+):
+    graph = get_entity_graph()
+    start = _entity_node(graph, source)
+    end = _entity_node(graph, target)
+
+    allowed = None
+    if via:
+        allowed = {resource.strip() for resource in via.split(",") if resource.strip()}
+        unknown = allowed - set(RESOURCES)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"recursos inválidos em via: {', '.join(sorted(unknown))}")
+
+    path = graph.shortest_path(start, end, allowed)
+    if path is None:
+        raise HTTPException(status_code=404, detail="nenhuma conexão entre as entidades")
+
+    return {
+        "source": graph.describe(start),
+        "target": graph.describe(end),
+        "length": len(path) - 1,
+        "path": [graph.describe(n) for n in path],
+    }
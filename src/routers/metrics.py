@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+
+from services.swapi_services import get_cache_metrics, get_upstream_metrics
+
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/upstream")
+def upstream_metrics():
+    return get_upstream_metrics()
+
+
+@router.get("/cache")
+def cache_metrics():
+    return get_cache_metrics()
@@ -1,33 +1,50 @@
 # routers/people.py
 from fastapi import APIRouter, Depends, Query
-from schemas.types_class import Films, GenderCountResponse, PaginatedPeopleResponse, PeopleRequest, PeopleResponse, Species, Starships, StatisticHeightResponse, StatisticMassResponse, TypeGender, Vehicles
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_exact_filters, apply_smart_filters, filter_no_gender
+from schemas.types_class import Films, GenderCountResponse, PaginatedPeopleResponse, PeopleRequest, PeopleResponse, SparsePaginatedResponse, Species, Starships, StatisticHeightResponse, StatisticMassResponse, TypeGender, Vehicles
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_column, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.bitsets import from_ordinals
+from utils.columns import range_filter_ordinals
+from utils.filter_expression import filter_expression_bits
+from utils.filters import apply_exact_filters, smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import relation_filter_ordinals
 
 router = APIRouter(prefix="/people", tags=["people"])
 
 
 
 @router.get("/by-id/{id}")
-def get_people_by_id(id: int):
-    people_data = fetch_data_by_id("people", id)
+async def get_people_by_id(id: int):
+    people_data = await fetch_data_by_id("people", id)
     return people_data
 
 
 
+@router.get("/batch")
+async def get_people_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("people", parse_ids(ids))}
+
+
 @router.get(
     "/gender_count",
     response_model=GenderCountResponse,
     response_model_exclude_unset=True
 )
+@materialized_view
 def gender_count():
     data = fetch_data("people")
 
     masc_filter = {"gender": "male"}
     fem_filter = {"gender": "female"}
 
-    result_masc = apply_exact_filters(data, masc_filter)
-    result_fem = apply_exact_filters(data, fem_filter)
+    result_masc = apply_exact_filters(data, masc_filter, get_text_index("people"))
+    result_fem = apply_exact_filters(data, fem_filter, get_text_index("people"))
 
     count_masc = len(result_masc)
     count_fem = len(result_fem)
@@ -43,41 +60,34 @@ def gender_count():
     return response
 
 
+def _gender_selector(gender: TypeGender | None) -> int | None:
+    if not gender:
+        return None
+
+    index = get_text_index("people")
+    if gender == TypeGender.others:
+        ordinals = index.exclude("gender", ("male", "female"))
+    else:
+        ordinals = index.exact("gender", gender.value)
+
+    return from_ordinals(ordinals, len(index.items))
+
+
 @router.get(
     "/statistics_height_people",
     response_model=StatisticHeightResponse,
     response_model_exclude_unset=True
 )
+@materialized_view
 def statistics_height_people(gender: TypeGender = Query(None, description="type gender")):
-    data = fetch_data("people")
-
-    if gender == TypeGender.others:
-        result = filter_no_gender(data)
-    elif gender:
-        result = apply_exact_filters(data, {"gender": gender.value})
-    else:
-        result = data
-    
-    heights = []
-    for person in result:
-        if person["height"].isdigit():
-            heights.append(int(person["height"]))
-
-    if not heights:
-        avg_height = min_height = max_height = 0
-        count_total = 0
-    else:
-        avg_height = sum(heights) / len(heights)
-        min_height = min(heights)
-        max_height = max(heights)
-        count_total = len(heights)
+    stats = get_numeric_column("people", "height").stats(_gender_selector(gender))
 
     response = StatisticHeightResponse(
         gender = gender,
-        count_total_people= count_total,
-        avgHeight= avg_height,
-        minHeight= min_height,
-        maxHeight= max_height
+        count_total_people= stats.count,
+        avgHeight= stats.avg,
+        minHeight= stats.min,
+        maxHeight= stats.max
     )
     return response
 
@@ -87,61 +97,61 @@ def statistics_height_people(gender: TypeGender = Query(None, description="type
     response_model=StatisticMassResponse,
     response_model_exclude_unset=True
 )
+@materialized_view
 def statistics_mass_people(gender: TypeGender = Query(None, description="type gender")):
-    data = fetch_data("people")
-
-    if gender == TypeGender.others:
-        result = filter_no_gender(data)
-    elif gender:
-        result = apply_exact_filters(data, {"gender": gender.value})
-    else:
-        result = data
-
-    masses = []
-
-    for person in result:
-        if person["mass"].isdigit():
-            masses.append(int(person["mass"]))
-
-    if not masses:
-        avg_mass = min_mass = max_mass = 0
-        count_total = 0
-    else:
-        avg_mass = sum(masses) / len(masses)
-        min_mass = min(masses)
-        max_mass = max(masses)
-        count_total = len(masses)
+    stats = get_numeric_column("people", "mass").stats(_gender_selector(gender))
 
     response = StatisticMassResponse(
         gender=gender,
-        count_total_people=count_total,
-        avgMass=avg_mass,
-        minMass=min_mass,
-        maxMass=max_mass
+        count_total_people=stats.count,
+        avgMass=stats.avg,
+        minMass=stats.min,
+        maxMass=stats.max
     )
 
     return response
 
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_PEOPLE_EXPANDERS = {
+    "homeworld": lambda graph, item: (graph.related_one(item, "homeworld") or {}).get("name"),
+    "films": lambda graph, item: [
+        Films(title=film["title"], director=film["director"])
+        for film in graph.related(item, "films")
+    ],
+    "species": lambda graph, item: [
+        Species(name=specie["name"], classification=specie["classification"])
+        for specie in graph.related(item, "species")
+    ],
+    "vehicles": lambda graph, item: [
+        Vehicles(name=vehicle["name"], model=vehicle["model"])
+        for vehicle in graph.related(item, "vehicles")
+    ],
+    "starships": lambda graph, item: [
+        Starships(
+            name=ship["name"],
+            model=ship["model"],
+            pilots=[pilot["name"] for pilot in graph.related(ship, "pilots")]
+        )
+        for ship in graph.related(item, "starships")
+    ],
+}
+
+
+register_fragment_builder("people", PeopleResponse, _PEOPLE_EXPANDERS)
+
+
 @router.get(
     "/list_people_by_filters",
-    response_model=PaginatedPeopleResponse,
+    response_model=PaginatedPeopleResponse | SparsePaginatedResponse,
     response_model_exclude_unset=True
 )
+@cached_response
 def list_people_by_filters(request: PeopleRequest = Depends()):
 
-    people_data = fetch_data("people")
-    films_data = fetch_data("films")
-    species_data = fetch_data("species")
-    vehicles_data = fetch_data("vehicles")
-    starships_data = fetch_data("starships")
-    planets_data = fetch_data("planets")
-
-    films_map = {f["url"]: f for f in films_data}
-    species_map = {s["url"]: s for s in species_data}
-    vehicles_map = {v["url"]: v for v in vehicles_data}
-    starships_map = {s["url"]: s for s in starships_data}
-    planets_map = {p["url"]: p for p in planets_data}
-    people_map = {p["url"]: p for p in people_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("people", fields, expand)
 
     filters = {}
 
@@ -158,106 +168,13 @@ def list_people_by_filters(request: PeopleRequest = Depends()):
     if request.birth_year:
         filters["birth_year"] = request.birth_year
 
-    result = (
-        people_data if not filters
-        else apply_smart_filters(people_data, filters)
-    )
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
+    matched = smart_filter_ordinals(get_text_index("people"), filters)
+    matched = range_filter_ordinals(get_numeric_columns("people"), request, matched)
+    matched = relation_filter_ordinals(get_relation_graph(), get_text_index, "people", request.related, matched)
+    matched = filter_expression_bits(request.filter, "people", current_dataset(), matched)
 
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated_result = result[start:end]
-
-    response: list[PeopleResponse] = []
-
-    for p in paginated_result:
-
-        homeworld = None
-        if p.get("homeworld") in planets_map:
-            homeworld = planets_map[p["homeworld"]]["name"]
-
-        films = [
-            Films(
-                title=films_map[url]["title"],
-                director=films_map[url]["director"]
-            )
-            for url in p.get("films", [])
-            if url in films_map
-        ]
-
-        species = [
-            Species(
-                name=species_map[url]["name"],
-                classification=species_map[url]["classification"]
-            )
-            for url in p.get("species", [])
-            if url in species_map
-        ]
-
-        vehicles = [
-            Vehicles(
-                name=vehicles_map[url]["name"],
-                model=vehicles_map[url]["model"]
-            )
-            for url in p.get("vehicles", [])
-            if url in vehicles_map
-        ]
-
-        starships = []
-        for url in p.get("starships", []):
-            if url not in starships_map:
-                continue
-
-            ship = starships_map[url]
-            pilots = [
-                people_map[pilot]["name"]
-                for pilot in ship.get("pilots", [])
-                if pilot in people_map
-            ]
-
-            starships.append(
-                Starships(
-                    name=ship["name"],
-                    model=ship["model"],
-                    pilots=pilots
-                )
-            )
-
-        response.append(
-            PeopleResponse(
-                name=p["name"],
-                height=p["height"],
-                mass=p["mass"],
-                gender=p["gender"],
-                hair_color=p["hair_color"],
-                eye_color=p["eye_color"],
-                skin_color=p["skin_color"],
-                birth_year=p["birth_year"],
-                homeworld=homeworld,
-                films=films,
-                species=species,
-                vehicles=vehicles,
-                starships=starships,
-                url_id=p["url"]
-            )
-        )
+    total, paginated_result, next_cursor = paginate(get_ordering("people"), matched, request)
 
-    return PaginatedPeopleResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    return paginated_response("people", request.page, request.page_size, total, paginated_result, next_cursor, fields, expand)
 
 
@@ -1,30 +1,61 @@
 from fastapi import APIRouter, Depends, Query
 
-from schemas.types_class import Films, PaginatedPlanetsResponse, People, PlanetRequest, PlanetResponse, PopulationStatisticsResponse, TopPlanetsByPopulation, TopPlanetsByResidents
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_smart_filters
+from schemas.types_class import Films, PaginatedPlanetsResponse, People, PlanetRequest, PlanetResponse, PopulationStatisticsResponse, SparsePaginatedResponse, TopPlanetsByPopulation, TopPlanetsByResidents
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_column, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.columns import range_filter_ordinals
+from utils.filter_expression import filter_expression_bits
+from utils.filters import smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import relation_filter_ordinals
 
 
 router = APIRouter(prefix="/planets", tags=["planets"])
 
 
 @router.get("/by-id/{id}")
-def get_planets_by_id(id: int):
-    people_data = fetch_data_by_id("planets", id)
+async def get_planets_by_id(id: int):
+    people_data = await fetch_data_by_id("planets", id)
     return people_data
 
+
+
+@router.get("/batch")
+async def get_planets_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("planets", parse_ids(ids))}
+
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_PLANETS_EXPANDERS = {
+    "residents": lambda graph, item: [
+        People(name=person["name"])
+        for person in graph.related(item, "residents")
+    ],
+    "films": lambda graph, item: [
+        Films(title=film["title"], director=film["director"])
+        for film in graph.related(item, "films")
+    ],
+}
+
+
+register_fragment_builder("planets", PlanetResponse, _PLANETS_EXPANDERS)
+
+
 @router.get(
     "/list_planets_by_filters",
-    response_model=PaginatedPlanetsResponse
+    response_model=PaginatedPlanetsResponse | SparsePaginatedResponse
 )
+@cached_response
 def list_planets_by_filters(request: PlanetRequest = Depends()):
 
-    planets_data = fetch_data("planets")
-    people_data = fetch_data("people")
-    films_data = fetch_data("films")
-
-    people_map = {p["url"]: p for p in people_data}
-    films_map = {f["url"]: f for f in films_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("planets", fields, expand)
 
     filters = {}
 
@@ -35,76 +66,15 @@ def list_planets_by_filters(request: PlanetRequest = Depends()):
     if request.terrain:
         filters["terrain"] = request.terrain
 
-    result = (
-        planets_data if not filters
-        else apply_smart_filters(planets_data, filters)
-    )
+    matched = smart_filter_ordinals(get_text_index("planets"), filters)
 
-    if request.min_population is not None:
-        result = [
-            p for p in result
-            if p["population"].isdigit()
-            and int(p["population"]) >= request.min_population
-        ]
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
-
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated = result[start:end]
-
-    response: list[PlanetResponse] = []
-
-    for p in paginated:
-
-        residents = [
-            People(name=people_map[url]["name"])
-            for url in p.get("residents", [])
-            if url in people_map
-        ]
-
-        films = [
-            Films(
-                title=films_map[url]["title"],
-                director=films_map[url]["director"]
-            )
-            for url in p.get("films", [])
-            if url in films_map
-        ]
-
-        response.append(
-            PlanetResponse(
-                name=p["name"],
-                rotation_period=p["rotation_period"],
-                orbital_period=p["orbital_period"],
-                diameter=p["diameter"],
-                climate=p["climate"],
-                terrain=p["terrain"],
-                gravity=p["gravity"],
-                population=p["population"],
-                surface_water=p["surface_water"],
-                residents=residents,
-                films=films,
-                url_id=p["url"]
-            )
-        )
-
-    return PaginatedPlanetsResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    matched = range_filter_ordinals(get_numeric_columns("planets"), request, matched)
+    matched = relation_filter_ordinals(get_relation_graph(), get_text_index, "planets", request.related, matched)
+    matched = filter_expression_bits(request.filter, "planets", current_dataset(), matched)
+
+    total, paginated, next_cursor = paginate(get_ordering("planets"), matched, request)
+
+    return paginated_response("planets", request.page, request.page_size, total, paginated, next_cursor, fields, expand)
 
 
 
@@ -112,35 +82,23 @@ def list_planets_by_filters(request: PlanetRequest = Depends()):
     "/population_statistics",
     response_model=PopulationStatisticsResponse
 )
+@materialized_view
 def population_statistics():
 
     data = fetch_data("planets")
+    column = get_numeric_column("planets", "population")
 
-    populations = []
-    inhabited = 0
-    not_inhabited = 0
-
-    for planet in data:
-        population = planet.get("population", "")
-
-        if population.isdigit():
-            value = int(population)
-            populations.append(value)
-
-            if value > 0:
-                inhabited += 1
-            else:
-                not_inhabited += 1
-        else:
-            not_inhabited += 1
+    populations = column.known()
+    stats = column.stats()
+    inhabited = sum(1 for value in populations if value > 0)
 
     return PopulationStatisticsResponse(
         total_planets=len(data),
         inhabited=inhabited,
-        not_inhabited=not_inhabited,
-        avg_population=sum(populations) / len(populations) if populations else 0,
-        max_population=max(populations) if populations else 0,
-        min_population=min(populations) if populations else 0
+        not_inhabited=len(data) - inhabited,
+        avg_population=stats.avg,
+        max_population=stats.max,
+        min_population=stats.min
     )
 
 
@@ -149,24 +107,26 @@ def population_statistics():
     response_model=TopPlanetsByPopulation
     
 )
+@materialized_view
 def top_planets_by_population():
     data = fetch_data("planets")
+    column = get_numeric_column("planets", "population")
 
     planets = []
     no_population = []
 
-    for p in data:
-        population = p.get("population")
+    for i, p in enumerate(data):
+        population = column.get(i)
 
-        if population and population.isdigit():
+        if population is not None:
             planets.append({
                 "name": p["name"],
-                "population": int(population)
+                "population": population
             })
         else:
             no_population.append({
                 "name": p["name"],
-                "population": population
+                "population": p.get("population")
             })
 
     planets.sort(key=lambda x: x["population"], reverse=True)
@@ -180,6 +140,7 @@ def top_planets_by_population():
     "/top-residents",
     response_model=TopPlanetsByResidents
 )
+@materialized_view
 def top_planets_by_residents():
     data = fetch_data("planets")
 
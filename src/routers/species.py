@@ -1,8 +1,18 @@
 from fastapi import APIRouter, Depends, Query
 
-from schemas.types_class import Films, PaginatedSpeciesResponse, People, SpeciesRequest, SpeciesResponse
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_smart_filters, safe_int
+from schemas.types_class import Films, PaginatedSpeciesResponse, People, SparsePaginatedResponse, SpeciesRequest, SpeciesResponse
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_column, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.columns import range_filter_ordinals, top_record
+from utils.filter_expression import filter_expression_bits
+from utils.filters import smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import relation_filter_ordinals
 
 
 
@@ -10,27 +20,44 @@ from utils.filters import apply_smart_filters, safe_int
 router = APIRouter(prefix="/species", tags=["species"])
 
 @router.get("/by-id/{id}")
-def get_species_by_id(id: int):
-    species_data = fetch_data_by_id("species", id)
+async def get_species_by_id(id: int):
+    species_data = await fetch_data_by_id("species", id)
     return species_data
 
 
 
+@router.get("/batch")
+async def get_species_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("species", parse_ids(ids))}
+
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_SPECIES_EXPANDERS = {
+    "homeworld": lambda graph, item: (graph.related_one(item, "homeworld") or {}).get("name"),
+    "people": lambda graph, item: [
+        People(name=person["name"])
+        for person in graph.related(item, "people")
+    ],
+    "films": lambda graph, item: [
+        Films(title=film["title"], director=film["director"])
+        for film in graph.related(item, "films")
+    ],
+}
+
+
+register_fragment_builder("species", SpeciesResponse, _SPECIES_EXPANDERS)
+
 
 @router.get(
     "/list_species_by_filters",
-    response_model=PaginatedSpeciesResponse
+    response_model=PaginatedSpeciesResponse | SparsePaginatedResponse
 )
+@cached_response
 def list_species_by_filters(request: SpeciesRequest = Depends()):
 
-    species_data = fetch_data("species")
-    people_data = fetch_data("people")
-    films_data = fetch_data("films")
-    planets_data = fetch_data("planets")
-
-    people_map = {p["url"]: p for p in people_data}
-    films_map = {f["url"]: f for f in films_data}
-    planets_map = {p["url"]: p for p in planets_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("species", fields, expand)
 
     filters = {}
 
@@ -43,78 +70,18 @@ def list_species_by_filters(request: SpeciesRequest = Depends()):
     if request.language:
         filters["language"] = request.language
 
-    result = (
-        species_data if not filters
-        else apply_smart_filters(species_data, filters)
-    )
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
-
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated = result[start:end]
-
-    response: list[SpeciesResponse] = []
-
-    for s in paginated:
-
-        
-        homeworld = None
-        if s.get("homeworld") in planets_map:
-            homeworld = planets_map[s["homeworld"]]["name"]
-
-        people = [
-            People(name=people_map[url]["name"])
-            for url in s.get("people", [])
-            if url in people_map
-        ]
-
-        films = [
-            Films(
-                title=films_map[url]["title"],
-                director=films_map[url]["director"]
-            )
-            for url in s.get("films", [])
-            if url in films_map
-        ]
-
-        response.append(
-            SpeciesResponse(
-                name=s["name"],
-                classification=s["classification"],
-                designation=s["designation"],
-                average_height=s["average_height"],
-                skin_colors=s["skin_colors"],
-                hair_colors=s["hair_colors"],
-                eye_colors=s["eye_colors"],
-                average_lifespan=s["average_lifespan"],
-                homeworld=homeworld, 
-                language=s["language"],
-                people=people,
-                films=films,
-                url_id=s["url"]
-            )
-        )
-
-    return PaginatedSpeciesResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    matched = smart_filter_ordinals(get_text_index("species"), filters)
+    matched = range_filter_ordinals(get_numeric_columns("species"), request, matched)
+    matched = relation_filter_ordinals(get_relation_graph(), get_text_index, "species", request.related, matched)
+    matched = filter_expression_bits(request.filter, "species", current_dataset(), matched)
+
+    total, paginated, next_cursor = paginate(get_ordering("species"), matched, request)
+
+    return paginated_response("species", request.page, request.page_size, total, paginated, next_cursor, fields, expand)
 
 
 @router.get("/stats/overview")
+@materialized_view
 def species_stats_overview():
 
     species = fetch_data("species")
@@ -139,66 +106,33 @@ def species_stats_overview():
 
 
 @router.get("/stats/height")
+@materialized_view
 def species_height_stats():
 
     species = fetch_data("species")
-
-    heights = []
-
-    tallest = None
-    max_height = 0
-
-    for s in species:
-        height = safe_int(s.get("average_height", ""))
-        if height is not None:
-            heights.append(height)
-
-            if height > max_height:
-                max_height = height
-                tallest = {
-                    "name": s["name"],
-                    "average_height": height
-                }
-
-    avg_height = sum(heights) / len(heights) if heights else 0
+    column = get_numeric_column("species", "average_height")
 
     return {
-        "average_height": round(avg_height, 2),
-        "tallest_species": tallest
+        "average_height": round(column.stats().avg, 2),
+        "tallest_species": top_record(species, column, "average_height")
     }
 
 
 @router.get("/stats/lifespan")
+@materialized_view
 def species_lifespan_stats():
 
     species = fetch_data("species")
-
-    lifespans = []
-
-    longest_living = None
-    max_lifespan = 0
-
-    for s in species:
-        lifespan = safe_int(s.get("average_lifespan", ""))
-        if lifespan is not None:
-            lifespans.append(lifespan)
-
-            if lifespan > max_lifespan:
-                max_lifespan = lifespan
-                longest_living = {
-                    "name": s["name"],
-                    "average_lifespan": lifespan
-                }
-
-    avg_lifespan = sum(lifespans) / len(lifespans) if lifespans else 0
+    column = get_numeric_column("species", "average_lifespan")
 
     return {
-        "average_lifespan": round(avg_lifespan, 2),
-        "longest_living_species": longest_living
+        "average_lifespan": round(column.stats().avg, 2),
+        "longest_living_species": top_record(species, column, "average_lifespan")
     }
 
 
 @router.get("/stats/most_appeared_in_movies")
+@materialized_view
 def most_appeared_in_movies():
 
     species = fetch_data("species")
@@ -219,6 +153,7 @@ def most_appeared_in_movies():
 
 
 @router.get("/stats/people")
+@materialized_view
 def species_people_stats():
 
     species = fetch_data("species")
@@ -239,6 +174,7 @@ def species_people_stats():
 
 
 @router.get("/stats/language")
+@materialized_view
 def species_language_stats():
 
     species = fetch_data("species")
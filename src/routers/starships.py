@@ -1,8 +1,18 @@
 from fastapi import APIRouter, Depends, Query
 
-from schemas.types_class import Films, PaginatedStarshipsResponse, People, StarshipsRequest, StarshipsResponse
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_smart_filters
+from schemas.types_class import Films, PaginatedStarshipsResponse, People, SparsePaginatedResponse, StarshipsRequest, StarshipsResponse
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.columns import range_filter_ordinals
+from utils.filter_expression import filter_expression_bits
+from utils.filters import smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import relation_filter_ordinals
 
 
 router = APIRouter(prefix="/starships", tags=["starships"])
@@ -10,22 +20,43 @@ router = APIRouter(prefix="/starships", tags=["starships"])
 
 
 @router.get("/by-id/{id}")
-def get_starships_by_id(id: int):
-    starships_data = fetch_data_by_id("starships", id)
+async def get_starships_by_id(id: int):
+    starships_data = await fetch_data_by_id("starships", id)
     return starships_data
 
+
+
+@router.get("/batch")
+async def get_starships_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("starships", parse_ids(ids))}
+
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_STARSHIPS_EXPANDERS = {
+    "pilots": lambda graph, item: [
+        People(name=person["name"])
+        for person in graph.related(item, "pilots")
+    ],
+    "films": lambda graph, item: [
+        Films(title=film["title"], director=film["director"])
+        for film in graph.related(item, "films")
+    ],
+}
+
+
+register_fragment_builder("starships", StarshipsResponse, _STARSHIPS_EXPANDERS)
+
+
 @router.get(
     "/list_starships_by_filters",
-    response_model=PaginatedStarshipsResponse
+    response_model=PaginatedStarshipsResponse | SparsePaginatedResponse
 )
+@cached_response
 def list_starships_by_filters(request: StarshipsRequest = Depends()):
 
-    starships_data = fetch_data("starships")
-    people_data = fetch_data("people")
-    films_data = fetch_data("films")
-
-    people_map = {p["url"]: p for p in people_data}
-    films_map = {f["url"]: f for f in films_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("starships", fields, expand)
 
     filters = {}
 
@@ -38,75 +69,17 @@ def list_starships_by_filters(request: StarshipsRequest = Depends()):
     if request.starship_class:
         filters["starship_class"] = request.starship_class
 
-    result = (
-        starships_data if not filters
-        else apply_smart_filters(starships_data, filters)
-    )
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
-
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated = result[start:end]
-
-    response: list[StarshipsResponse] = []
-
-    for s in paginated:
-
-        pilots = [
-            People(name=people_map[url]["name"])
-            for url in s.get("pilots", [])
-            if url in people_map
-        ]
-
-        films = [
-            Films(
-                title=films_map[url]["title"],
-                director=films_map[url]["director"]
-            )
-            for url in s.get("films", [])
-            if url in films_map
-        ]
-
-        response.append(
-            StarshipsResponse(
-                name=s["name"],
-                model=s["model"],
-                manufacturer=s["manufacturer"],
-                cost_in_credits=s["cost_in_credits"],
-                length=s["length"],
-                max_atmosphering_speed=s["max_atmosphering_speed"],
-                crew=s["crew"],
-                passengers=s["passengers"],
-                cargo_capacity=s["cargo_capacity"],
-                consumables=s["consumables"],
-                hyperdrive_rating=s["hyperdrive_rating"],
-                MGLT=s["MGLT"],
-                starship_class=s["starship_class"],
-                pilots=pilots,
-                films=films,
-                url_id=s["url"]
-            )
-        )
-
-    return PaginatedStarshipsResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    matched = smart_filter_ordinals(get_text_index("starships"), filters)
+    matched = range_filter_ordinals(get_numeric_columns("starships"), request, matched)
+    matched = relation_filter_ordinals(get_relation_graph(), get_text_index, "starships", request.related, matched)
+    matched = filter_expression_bits(request.filter, "starships", current_dataset(), matched)
+
+    total, paginated, next_cursor = paginate(get_ordering("starships"), matched, request)
+
+    return paginated_response("starships", request.page, request.page_size, total, paginated, next_cursor, fields, expand)
 
 @router.get("/stats/overview")
+@materialized_view
 def starships_stats_overview():
 
     starships = fetch_data("starships")
@@ -129,6 +102,7 @@ def starships_stats_overview():
 
 
 @router.get("/stats/most_appared_in_movies")
+@materialized_view
 def starships_most_appeared():
 
     starships = fetch_data("starships")
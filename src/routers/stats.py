@@ -0,0 +1,50 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from schemas.types_class import Types
+from services.swapi_services import fetch_data, get_numeric_columns, get_text_index
+from utils.columns import aggregate
+
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/aggregate")
+def aggregate_stats(
+    type: Types = Query(..., description="Tipo de recurso da SWAPI"),
+    field: str = Query(..., description="Campo numérico (ex.: height, population, cost_in_credits)"),
+    group_by: str | None = Query(None, description="Campo categórico para agrupar (ex.: gender, climate)"),
+    percentiles: list[float] = Query([50, 90, 99], description="Percentis a calcular (0-100)")
+):
+    columns = get_numeric_columns(type.value)
+
+    if field not in columns:
+        raise HTTPException(
+            status_code=400,
+            detail=f"campo numérico inválido para {type.value}; opções: {', '.join(columns)}"
+        )
+
+    if any(p < 0 or p > 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="percentis devem estar entre 0 e 100")
+
+    groups = None
+    if group_by:
+        fields = get_text_index(type.value).values
+        if group_by not in fields or group_by in columns:
+            raise HTTPException(status_code=400, detail=f"campo de agrupamento inválido: {group_by}")
+
+        groups = [item.get(group_by) for item in fetch_data(type.value)]
+
+    column = columns[field]
+    result = aggregate(column, groups, percentiles)
+
+    return {
+        "type": type.value,
+        "field": field,
+        "group_by": group_by,
+        "total": len(column),
+        "without_value": len(column) - len(column.sorted_ordinals),
+        "groups": [
+            {"key": key, **values}
+            for key, values in sorted(result.items(), key=lambda x: x[1]["count"], reverse=True)
+        ]
+    }
@@ -1,9 +1,19 @@
-from fastapi import APIRouter, Depends
-
-
-from schemas.types_class import Films, PaginatedVehiclesResponse, People, VehiclesRequest, VehiclesResponse
-from services.swapi_services import extract_id_from_url, fetch_data, fetch_data_by_id
-from utils.filters import apply_smart_filters, safe_int
+from fastapi import APIRouter, Depends, Query
+
+
+from schemas.types_class import Films, PaginatedVehiclesResponse, People, SparsePaginatedResponse, VehiclesRequest, VehiclesResponse
+from services.batch import parse_ids, resolve_ids
+from services.dataset import current_dataset
+from services.fragments import check_projection, paginated_response, register_fragment_builder
+from services.materialized import materialized_view
+from services.response_cache import cached_response
+from services.swapi_services import fetch_data, fetch_data_by_id, get_numeric_column, get_numeric_columns, get_ordering, get_relation_graph, get_text_index
+from utils.columns import range_filter_ordinals, top_record
+from utils.filter_expression import filter_expression_bits
+from utils.filters import smart_filter_ordinals
+from utils.pagination import paginate
+from utils.projection import parse_expand, parse_fields
+from utils.relation_filters import relation_filter_ordinals
 
 router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
@@ -11,23 +21,43 @@ router = APIRouter(prefix="/vehicles", tags=["vehicles"])
 
 
 @router.get("/by-id/{id}")
-def get_vehicles_by_id(id: int):
-    vehicles_data = fetch_data_by_id("vehicles", id)
+async def get_vehicles_by_id(id: int):
+    vehicles_data = await fetch_data_by_id("vehicles", id)
     return vehicles_data
 
 
+
+@router.get("/batch")
+async def get_vehicles_batch(ids: str = Query(..., description="Ids separados por vírgula (ex.: 1,2,5)")):
+    return {"results": await resolve_ids("vehicles", parse_ids(ids))}
+
+
+# como cada relação é expandida na resposta; campos não pedidos em fields= nem chegam a ser montados
+_VEHICLES_EXPANDERS = {
+    "pilots": lambda graph, item: [
+        People(name=person["name"])
+        for person in graph.related(item, "pilots")
+    ],
+    "films": lambda graph, item: [
+        Films(title=film["title"], director=film["director"])
+        for film in graph.related(item, "films")
+    ],
+}
+
+
+register_fragment_builder("vehicles", VehiclesResponse, _VEHICLES_EXPANDERS)
+
+
 @router.get(
     "/list_vehicles_by_filters",
-    response_model=PaginatedVehiclesResponse
+    response_model=PaginatedVehiclesResponse | SparsePaginatedResponse
 )
+@cached_response
 def list_vehicles_by_filters(request: VehiclesRequest = Depends()):
 
-    vehicles_data = fetch_data("vehicles")
-    people_data = fetch_data("people")
-    films_data = fetch_data("films")
-
-    people_map = {p["url"]: p for p in people_data}
-    films_map = {f["url"]: f for f in films_data}
+    fields = parse_fields(request.fields)
+    expand = parse_expand(request.expand)
+    check_projection("vehicles", fields, expand)
 
     filters = {}
 
@@ -40,74 +70,18 @@ def list_vehicles_by_filters(request: VehiclesRequest = Depends()):
     if request.vehicle_class:
         filters["vehicle_class"] = request.vehicle_class
 
-    result = (
-        vehicles_data if not filters
-        else apply_smart_filters(vehicles_data, filters)
-    )
-
-    if request.order_by == "url":
-        result.sort(
-            key=lambda x: extract_id_from_url(x.get("url")),
-            reverse=request.order_dir == "desc"
-        )
-    else:
-        result.sort(
-            key=lambda x: (x.get(request.order_by) or "").lower(),
-            reverse=request.order_dir == "desc"
-        )
-
-    total = len(result)
-    start = (request.page - 1) * request.page_size
-    end = start + request.page_size
-    paginated = result[start:end]
-
-    response: list[VehiclesResponse] = []
-
-    for v in paginated:
-
-        pilots = [
-            People(name=people_map[url]["name"])
-            for url in v.get("pilots", [])
-            if url in people_map
-        ]
-
-        films = [
-            Films(
-                title=films_map[url]["title"],
-                director=films_map[url]["director"]
-            )
-            for url in v.get("films", [])
-            if url in films_map
-        ]
-
-        response.append(
-            VehiclesResponse(
-                name=v["name"],
-                model=v["model"],
-                manufacturer=v["manufacturer"],
-                cost_in_credits=v["cost_in_credits"],
-                length=v["length"],
-                max_atmosphering_speed=v["max_atmosphering_speed"],
-                crew=v["crew"],
-                passengers=v["passengers"],
-                cargo_capacity=v["cargo_capacity"],
-                consumables=v["consumables"],
-                vehicle_class=v["vehicle_class"],
-                pilots=pilots,
-                films=films,
-                url_id=v["url"]
-            )
-        )
-
-    return PaginatedVehiclesResponse(
-        page=request.page,
-        page_size=request.page_size,
-        total=total,
-        results=response
-    )
+    matched = smart_filter_ordinals(get_text_index("vehicles"), filters)
+    matched = range_filter_ordinals(get_numeric_columns("vehicles"), request, matched)
+    matched = relation_filter_ordinals(get_relation_graph(), get_text_index, "vehicles", request.related, matched)
+    matched = filter_expression_bits(request.filter, "vehicles", current_dataset(), matched)
+
+    total, paginated, next_cursor = paginate(get_ordering("vehicles"), matched, request)
+
+    return paginated_response("vehicles", request.page, request.page_size, total, paginated, next_cursor, fields, expand)
 
 
 @router.get("/stats/overview")
+@materialized_view
 def vehicles_stats_overview():
 
     vehicles = fetch_data("vehicles")
@@ -132,93 +106,46 @@ def vehicles_stats_overview():
 
 
 @router.get("/stats/cost")
+@materialized_view
 def vehicles_cost_stats():
 
     vehicles = fetch_data("vehicles")
-
-    costs = []
-    most_expensive = None
-    max_cost = 0
-
-    for v in vehicles:
-        cost = safe_int(v.get("cost_in_credits", ""))
-        if cost is not None:
-            costs.append(cost)
-
-            if cost > max_cost:
-                max_cost = cost
-                most_expensive = {
-                    "name": v["name"],
-                    "cost_in_credits": cost
-                }
-
-    avg_cost = sum(costs) / len(costs) if costs else 0
+    column = get_numeric_column("vehicles", "cost_in_credits")
 
     return {
-        "average_cost": round(avg_cost, 2),
-        "most_expensive_vehicle": most_expensive
+        "average_cost": round(column.stats().avg, 2),
+        "most_expensive_vehicle": top_record(vehicles, column, "cost_in_credits")
     }
 
 
 @router.get("/stats/cargo")
+@materialized_view
 def vehicles_cargo_stats():
 
     vehicles = fetch_data("vehicles")
-
-    cargos = []
-    highest_cargo = None
-    max_cargo = 0
-
-    for v in vehicles:
-        cargo = safe_int(v.get("cargo_capacity", ""))
-        if cargo is not None:
-            cargos.append(cargo)
-
-            if cargo > max_cargo:
-                max_cargo = cargo
-                highest_cargo = {
-                    "name": v["name"],
-                    "cargo_capacity": cargo
-                }
-
-    avg_cargo = sum(cargos) / len(cargos) if cargos else 0
+    column = get_numeric_column("vehicles", "cargo_capacity")
 
     return {
-        "average_cargo_capacity": round(avg_cargo, 2),
-        "highest_cargo_vehicle": highest_cargo
+        "average_cargo_capacity": round(column.stats().avg, 2),
+        "highest_cargo_vehicle": top_record(vehicles, column, "cargo_capacity")
     }
 
 
 @router.get("/stats/speed")
+@materialized_view
 def vehicles_speed_stats():
 
     vehicles = fetch_data("vehicles")
-
-    speeds = []
-    fastest = None
-    max_speed = 0
-
-    for v in vehicles:
-        speed = safe_int(v.get("max_atmosphering_speed", ""))
-        if speed is not None:
-            speeds.append(speed)
-
-            if speed > max_speed:
-                max_speed = speed
-                fastest = {
-                    "name": v["name"],
-                    "max_atmosphering_speed": speed
-                }
-
-    avg_speed = sum(speeds) / len(speeds) if speeds else 0
+    column = get_numeric_column("vehicles", "max_atmosphering_speed")
 
     return {
-        "average_speed": round(avg_speed, 2),
-        "fastest_vehicle": fastest
+        "average_speed": round(column.stats().avg, 2),
+        "fastest_vehicle": top_record(vehicles, column, "max_atmosphering_speed")
     }
 
 
 @router.get("/stats/most_appeared_in_movies")
+@materialized_view
 def most_appeared_in_movies():
 
     vehicles = fetch_data("vehicles")
@@ -1,10 +1,12 @@
 
 from datetime import date
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from utils.pagination import MAX_PAGE_SIZE
+
 class Types(str, Enum):
     people = "people"
     planets = "planets"
@@ -14,6 +16,15 @@ class Types(str, Enum):
     vehicles = "vehicles"
 
 
+# recursos que aparecem nos filmes (co-aparição)
+class FilmMember(str, Enum):
+    people = "people"
+    planets = "planets"
+    species = "species"
+    starships = "starships"
+    vehicles = "vehicles"
+
+
 class TypeGender(str, Enum):
     male = "male"
     female = "female"
@@ -44,6 +55,18 @@ class Planets(BaseModel):
     population: int | str
 
 
+# forma das listagens com fields= ou expand=: cada registro traz só os campos
+# pedidos e as relações não expandidas chegam como urls do swapi
+class SparsePaginatedResponse(BaseModel):
+    page: int
+    page_size: int
+    total: int
+    next_cursor: Optional[str] = None
+    results: list[dict[str, Any]] = Field(
+        description="Registros só com os campos de fields=; relações fora de expand= vêm como urls"
+    )
+
+
 #-- PEOPLE
 
 class PeopleRequest(BaseModel):
@@ -54,11 +77,28 @@ class PeopleRequest(BaseModel):
     skin_color: Optional[str] = None
     birth_year: Optional[str] = None
 
+    # faixas numéricas (inclusivas)
+    min_height: Optional[float] = None
+    max_height: Optional[float] = None
+    min_mass: Optional[float] = None
+    max_mass: Optional[float] = None
+
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
     page: int = Field(1, ge=1)
-    page_size: int = Field(10, ge=1, le=50)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=name,films&expand=films)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: species.homeworld:tatooine)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: gender:male AND height>180)
+    filter: Optional[str] = None
 
 class PeopleResponse(BaseModel):
     name: str
@@ -80,6 +120,7 @@ class PaginatedPeopleResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[PeopleResponse]
 
 
@@ -127,18 +168,41 @@ class PlanetRequest(BaseModel):
     name: Optional[str] = None
     climate: Optional[str] = None
     terrain: Optional[str] = None
+
+    # faixas numéricas (inclusivas)
     min_population: Optional[int] = None
+    max_population: Optional[int] = None
+    min_diameter: Optional[float] = None
+    max_diameter: Optional[float] = None
+    min_rotation_period: Optional[float] = None
+    max_rotation_period: Optional[float] = None
+    min_orbital_period: Optional[float] = None
+    max_orbital_period: Optional[float] = None
+    min_surface_water: Optional[float] = None
+    max_surface_water: Optional[float] = None
 
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=name,residents&expand=residents)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: residents.species:droid)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: climate~arid AND population>1000000)
+    filter: Optional[str] = None
 
 class PaginatedPlanetsResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[PlanetResponse]
 
 class TopPlanetsByPopulation(BaseModel):
@@ -190,6 +254,7 @@ class PaginatedFilmsResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[FilmsResponse]
 
 class FilmsRequest(BaseModel):
@@ -199,14 +264,29 @@ class FilmsRequest(BaseModel):
     producer: Optional[str] = None
     release_date: Optional[date] = None
 
-    name_people: Optional[str] = None  
+    name_people: Optional[str] = None
+
+    # faixas numéricas (inclusivas)
+    min_episode_id: Optional[int] = None
+    max_episode_id: Optional[int] = None
 
 
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=title,characters&expand=characters)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: starships.pilots:luke)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: director~lucas AND episode_id<4)
+    filter: Optional[str] = None
 
 class FilmsWithCountsResponse(BaseModel):
     results: list[FilmWithCounts]
@@ -237,16 +317,46 @@ class StarshipsRequest(BaseModel):
     manufacturer: Optional[str] = None
     starship_class: Optional[str] = None
 
+    # faixas numéricas (inclusivas)
+    min_cost_in_credits: Optional[float] = None
+    max_cost_in_credits: Optional[float] = None
+    min_length: Optional[float] = None
+    max_length: Optional[float] = None
+    min_max_atmosphering_speed: Optional[float] = None
+    max_max_atmosphering_speed: Optional[float] = None
+    min_crew: Optional[float] = None
+    max_crew: Optional[float] = None
+    min_passengers: Optional[float] = None
+    max_passengers: Optional[float] = None
+    min_cargo_capacity: Optional[float] = None
+    max_cargo_capacity: Optional[float] = None
+    min_hyperdrive_rating: Optional[float] = None
+    max_hyperdrive_rating: Optional[float] = None
+    min_MGLT: Optional[float] = None
+    max_MGLT: Optional[float] = None
+
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=name,pilots&expand=none)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: pilots.homeworld:tatooine)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: starship_class~fighter AND MGLT>=80)
+    filter: Optional[str] = None
     
 class PaginatedStarshipsResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[StarshipsResponse]
 
 
@@ -274,16 +384,34 @@ class SpeciesRequest(BaseModel):
     designation: Optional[str] = None
     language: Optional[str] = None
 
+    # faixas numéricas (inclusivas)
+    min_average_height: Optional[float] = None
+    max_average_height: Optional[float] = None
+    min_average_lifespan: Optional[float] = None
+    max_average_lifespan: Optional[float] = None
+
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=name,people&expand=people)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: people.starships:x-wing)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: classification:mammal AND average_lifespan>100)
+    filter: Optional[str] = None
 
 class PaginatedSpeciesResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[SpeciesResponse]
 
 
@@ -313,15 +441,46 @@ class VehiclesRequest(BaseModel):
     manufacturer: Optional[str] = None
     vehicle_class: Optional[str] = None
 
+    # faixas numéricas (inclusivas)
+    min_cost_in_credits: Optional[float] = None
+    max_cost_in_credits: Optional[float] = None
+    min_length: Optional[float] = None
+    max_length: Optional[float] = None
+    min_max_atmosphering_speed: Optional[float] = None
+    max_max_atmosphering_speed: Optional[float] = None
+    min_crew: Optional[float] = None
+    max_crew: Optional[float] = None
+    min_passengers: Optional[float] = None
+    max_passengers: Optional[float] = None
+    min_cargo_capacity: Optional[float] = None
+    max_cargo_capacity: Optional[float] = None
+
     order_by: Optional[str] = "url"
     order_dir: Optional[str] = "asc"
 
-    page: int = 1
-    page_size: int = 10
+    page: int = Field(1, ge=1)
+    page_size: int = Field(10, ge=1, le=MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+
+    # projeção: campos da resposta e relações a expandir, separados por vírgula (ex.: fields=name,pilots&expand=pilots)
+    fields: Optional[str] = None
+    expand: Optional[str] = None
+
+    # filtro por relação: caminho:nome (ex.: pilots.species:human)
+    related: Optional[str] = None
+
+    # expressão de filtro (ex.: vehicle_class~speeder OR max_atmosphering_speed>1000)
+    filter: Optional[str] = None
 
 class PaginatedVehiclesResponse(BaseModel):
     page: int
     page_size: int
     total: int
+    next_cursor: Optional[str] = None
     results: list[VehiclesResponse]
 
+
+#-- BATCH
+
+class BatchUrlsRequest(BaseModel):
+    urls: list[str]
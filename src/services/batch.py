@@ -0,0 +1,62 @@
+import asyncio
+
+from fastapi import HTTPException
+
+from services.dataset import RESOURCES
+from services.swapi_client import UpstreamUnavailable
+from services.swapi_services import fetch_data_by_id
+
+# limite de ids/urls por chamada de batch
+MAX_BATCH_SIZE = 100
+
+
+def parse_ids(ids: str) -> list[int]:
+    try:
+        parsed = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids deve ser uma lista de inteiros separados por vírgula")
+
+    if not parsed:
+        raise HTTPException(status_code=400, detail="informe ao menos um id")
+    if len(parsed) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"no máximo {MAX_BATCH_SIZE} itens por batch")
+    return parsed
+
+
+def parse_url(url: str) -> tuple[str, int] | None:
+    # .../api/<recurso>/<id>/
+    parts = url.rstrip("/").split("/")
+    if len(parts) < 2 or parts[-2] not in RESOURCES or not parts[-1].isdigit():
+        return None
+    return parts[-2], int(parts[-1])
+
+
+async def _resolve(resource: str, id: int) -> dict:
+    try:
+        data = await fetch_data_by_id(resource, id)
+    except UpstreamUnavailable:
+        return {"error": "SWAPI indisponível no momento"}
+
+    if not isinstance(data, dict) or "url" not in data:
+        return {"error": "não encontrado"}
+    return {"data": data}
+
+
+async def resolve_ids(resource: str, ids: list[int]) -> list[dict]:
+    # hits saem direto do índice; os misses vão ao swapi todos em paralelo
+    results = await asyncio.gather(*(_resolve(resource, id) for id in ids))
+    return [{"id": id, **result} for id, result in zip(ids, results)]
+
+
+async def resolve_urls(urls: list[str]) -> list[dict]:
+    if len(urls) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"no máximo {MAX_BATCH_SIZE} itens por batch")
+
+    async def resolve(url: str) -> dict:
+        target = parse_url(url)
+        if target is None:
+            return {"error": "url inválida"}
+        return await _resolve(*target)
+
+    results = await asyncio.gather(*(resolve(url) for url in urls))
+    return [{"url": url, **result} for url, result in zip(urls, results)]
@@ -0,0 +1,147 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+# cache LRU limitado por quantidade de entradas e com TTL por entrada.
+# depois do `ttl` a entrada fica velha: durante mais `stale_ttl` segundos ela
+# ainda é servida enquanto uma task em background busca o valor novo
+# (stale-while-revalidate); passado esse prazo ela expira de vez
+class TTLCache:
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries: OrderedDict[Hashable, tuple[object, float]] = OrderedDict()
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.state(key) != MISS
+
+    def state(self, key: Hashable) -> str:
+        # só consulta: não conta acesso nem mexe na ordem do LRU
+        entry = self._entries.get(key)
+        if entry is None:
+            return MISS
+
+        age = time.monotonic() - entry[1]
+        if age < self.ttl:
+            return FRESH
+        if age < self.ttl + self.stale_ttl:
+            return STALE
+        return MISS
+
+    def _lookup(self, key: Hashable) -> tuple[object, str]:
+        state = self.state(key)
+
+        if state == MISS:
+            self.misses += 1
+            if self._entries.pop(key, None) is not None:
+                self.expirations += 1
+            return None, MISS
+
+        if state == FRESH:
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+
+        self._entries.move_to_end(key)
+        return self._entries[key][0], state
+
+    def get(self, key: Hashable, default=None):
+        value, state = self._lookup(key)
+        return default if state == MISS else value
+
+    def set(self, key: Hashable, value) -> None:
+        self._entries[key] = (value, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable, default=None):
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable],
+        cacheable: Callable[[object], bool] | None = None,
+    ):
+        value, state = self._lookup(key)
+
+        if state == STALE:
+            self.revalidate(key, loader, cacheable)
+        if state != MISS:
+            return value
+
+        value = await loader()
+        if cacheable is None or cacheable(value):
+            self.set(key, value)
+        return value
+
+    def revalidate(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable],
+        cacheable: Callable[[object], bool] | None = None,
+    ) -> None:
+        # uma única atualização em background por chave
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                value = await loader()
+            except Exception as exc:
+                # mantém o valor velho até a próxima tentativa
+                self.refresh_errors += 1
+                print(f"⚠️ Falha ao atualizar {key!r} no cache: {exc!r}")
+                return
+
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+                self.refreshes += 1
+
+        task = asyncio.ensure_future(refresh())
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "stale_ttl": None if math.isinf(self.stale_ttl) else self.stale_ttl,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refreshing": len(self._refreshing),
+        }
@@ -0,0 +1,66 @@
+import heapq
+
+from services.relations import RelationGraph
+from utils.bitsets import iter_bits
+
+# campo de films que liga cada recurso aos filmes em que aparece
+FILM_MEMBERS: dict[str, str] = {
+    "people": "characters",
+    "planets": "planets",
+    "starships": "starships",
+    "vehicles": "vehicles",
+    "species": "species",
+}
+
+
+# matriz de co-aparição recurso x filmes guardada como bitsets (int do python):
+# films_of[recurso][i] tem o bit j ligado quando o registro i aparece no filme j
+# e members[recurso][j] é a coluna transposta (quem aparece no filme j).
+# interseções viram AND e contagens viram popcount, sem loops por registro
+class CoOccurrence:
+
+    def __init__(self, cache: dict[str, tuple[dict, ...]], graph: RelationGraph):
+        films = cache.get("films", ())
+        self.films_of: dict[str, list[int]] = {}
+        self.members: dict[str, list[int]] = {}
+
+        for resource, field in FILM_MEMBERS.items():
+            films_of = [0] * len(cache.get(resource, ()))
+            members = []
+
+            for film_ordinal, film in enumerate(films):
+                bits = 0
+                for item in graph.related(film, field):
+                    ordinal = graph.ordinals[item["url"]]
+                    bits |= 1 << ordinal
+                    films_of[ordinal] |= 1 << film_ordinal
+                members.append(bits)
+
+            self.films_of[resource] = films_of
+            self.members[resource] = members
+
+    def in_all_films(self, resource: str, film_ordinals: list[int]) -> list[int]:
+        # registros presentes em todos os filmes: AND das colunas
+        members = self.members[resource]
+        bits = members[film_ordinals[0]]
+        for film in film_ordinals[1:]:
+            bits &= members[film]
+        return list(iter_bits(bits))
+
+    def similar(self, resource: str, ordinal: int, k: int) -> list[tuple[int, float, int]]:
+        # top-k por Jaccard dos filmes: |A & B| / |A | B|
+        films_of = self.films_of[resource]
+        mine = films_of[ordinal]
+        if not mine:
+            return []
+
+        scored = (
+            ((mine & theirs).bit_count() / (mine | theirs).bit_count(), (mine & theirs).bit_count(), other)
+            for other, theirs in enumerate(films_of)
+            if other != ordinal and mine & theirs
+        )
+        return [(other, score, shared) for score, shared, other in heapq.nlargest(k, scored, key=lambda s: (s[0], s[1], -s[2]))]
+
+    def shared_films(self, resource: str, ordinal: int, other: int) -> list[int]:
+        films_of = self.films_of[resource]
+        return list(iter_bits(films_of[ordinal] & films_of[other]))
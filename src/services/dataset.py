@@ -0,0 +1,90 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from services.cooccurrence import CoOccurrence
+from services.entity_graph import EntityGraph
+from services.relations import RelationGraph, extract_id_from_url
+from utils.columns import NumericColumn, build_numeric_columns
+from utils.fast_json import dumps
+from utils.ordering import Ordering, build_orderings
+from utils.text_index import TextIndex, build_text_indexes
+
+RESOURCES = ("people", "planets", "films", "species", "starships", "vehicles")
+
+
+# uma geração completa do dataset: os registros e tudo que é derivado deles.
+# é montada inteira antes de entrar no ar e nunca é alterada depois
+class Dataset:
+
+    def __init__(self, cache: dict[str, tuple[dict, ...]], generation: int = 0):
+        self.generation = generation
+        self.loaded_at = time.time()
+
+        # depois do load cada recurso vira uma tupla: os dados são somente leitura
+        self.cache: dict[str, tuple[dict, ...]] = {
+            resource: tuple(cache.get(resource, ())) for resource in RESOURCES
+        }
+
+        # hash do conteúdo: o contador de geração recomeça a cada processo/instância,
+        # o fingerprint é igual em qualquer instância que carregou os mesmos dados
+        self.fingerprint = hashlib.blake2b(dumps(self.cache), digest_size=8).hexdigest()
+
+        # índice id -> registro de cada recurso
+        self.id_index: dict[str, dict[int, dict]] = {
+            resource: {extract_id_from_url(item.get("url")): item for item in items}
+            for resource, items in self.cache.items()
+        }
+
+        # grafo de relações url -> registro compartilhado pelos routers
+        self.graph = RelationGraph(self.cache)
+
+        # o mesmo grafo com ids inteiros e arestas em CSR, para travessias e BFS
+        self.entity_graph = EntityGraph(self.cache)
+
+        # quem aparece em quais filmes, em bitsets, para co-aparição e similaridade
+        self.cooccurrence = CoOccurrence(self.cache, self.graph)
+
+        # índices invertidos de texto usados pelos filtros
+        self.text_indexes: dict[str, TextIndex] = build_text_indexes(self.cache)
+
+        # permutações pré-ordenadas para o order_by das listagens
+        self.orderings: dict[str, Ordering] = build_orderings(self.cache)
+
+        # colunas numéricas tipadas (height, mass, population...) já convertidas das strings
+        self.numeric_columns: dict[str, dict[str, NumericColumn]] = build_numeric_columns(self.cache)
+
+    def counts(self) -> dict[str, int]:
+        return {resource: len(items) for resource, items in self.cache.items()}
+
+
+_CURRENT = Dataset({})
+
+# geração fixada para a requisição atual: mesmo que um reload troque o dataset
+# no meio dela, todas as leituras da requisição enxergam a mesma geração
+_PINNED: ContextVar[Dataset | None] = ContextVar("swapi_dataset", default=None)
+
+
+def current_dataset() -> Dataset:
+    return _PINNED.get() or _CURRENT
+
+
+def live_dataset() -> Dataset:
+    # a geração no ar, ignorando a fixada na requisição (usada pelo reload)
+    return _CURRENT
+
+
+def swap_dataset(dataset: Dataset) -> None:
+    # troca de referência única: quem já fixou a geração anterior segue com ela
+    global _CURRENT
+    _CURRENT = dataset
+
+
+@contextmanager
+def pinned_dataset(dataset: Dataset | None = None):
+    token = _PINNED.set(dataset or _CURRENT)
+    try:
+        yield _PINNED.get()
+    finally:
+        _PINNED.reset(token)
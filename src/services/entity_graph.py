@@ -0,0 +1,132 @@
+from array import array
+from collections import deque
+
+from services.relations import RELATION_FIELDS, as_urls, extract_id_from_url
+
+
+# grafo compacto de todas as entidades do swapi, montado uma vez por geração.
+# cada registro vira um nó inteiro (os recursos ocupam faixas contíguas, na
+# ordem do cache) e as arestas ficam em CSR: indices[indptr[n]:indptr[n + 1]]
+# são os vizinhos do nó n, sem nenhuma busca por url depois de montado
+class EntityGraph:
+
+    def __init__(self, cache: dict[str, tuple[dict, ...]]):
+        self.resources: list[str] = list(cache)
+        self.offsets: dict[str, int] = {}
+        self.items: list[dict] = []
+
+        for resource, items in cache.items():
+            self.offsets[resource] = len(self.items)
+            self.items.extend(items)
+
+        self.node_resource = array("b", (
+            position
+            for position, items in enumerate(cache.values())
+            for _ in items
+        ))
+        node_by_url = {item.get("url"): node for node, item in enumerate(self.items)}
+        self.node_by_key: dict[tuple[str, int], int] = {
+            (self.resources[self.node_resource[node]], extract_id_from_url(item["url"])): node
+            for node, item in enumerate(self.items)
+            if item.get("url")
+        }
+
+        # uma CSR por relação (recurso, campo) e uma não direcionada com tudo, para o BFS
+        self.relations: dict[tuple[str, str], tuple[array, array]] = {}
+        undirected: list[set[int]] = [set() for _ in self.items]
+
+        for resource, items in cache.items():
+            offset = self.offsets[resource]
+            for field in RELATION_FIELDS.get(resource, {}):
+                indptr = array("l", [0])
+                indices = array("l")
+
+                for ordinal, item in enumerate(items):
+                    node = offset + ordinal
+                    for url in as_urls(item.get(field)):
+                        target = node_by_url.get(url)
+                        if target is None:
+                            continue
+                        indices.append(target)
+                        undirected[node].add(target)
+                        undirected[target].add(node)
+                    indptr.append(len(indices))
+
+                self.relations[(resource, field)] = (indptr, indices)
+
+        self.indptr = array("l", [0])
+        self.indices = array("l")
+        for neighbours in undirected:
+            self.indices.extend(sorted(neighbours))
+            self.indptr.append(len(self.indices))
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def resource_of(self, node: int) -> str:
+        return self.resources[self.node_resource[node]]
+
+    def node(self, resource: str, id: int) -> int | None:
+        return self.node_by_key.get((resource, id))
+
+    def follow(self, nodes: list[int], field: str) -> list[int]:
+        # um salto da relação `field` a partir de nós do mesmo recurso; mantém a
+        # ordem de descoberta e descarta repetidos
+        seen: set[int] = set()
+        result: list[int] = []
+
+        for node in nodes:
+            resource = self.resource_of(node)
+            indptr, indices = self.relations[(resource, field)]
+            ordinal = node - self.offsets[resource]
+            for target in indices[indptr[ordinal]:indptr[ordinal + 1]]:
+                if target not in seen:
+                    seen.add(target)
+                    result.append(target)
+
+        return result
+
+    def shortest_path(self, source: int, target: int, allowed: set[str] | None = None) -> list[int] | None:
+        # BFS não direcionado; `allowed` restringe os recursos dos nós intermediários
+        if source == target:
+            return [source]
+
+        allowed_positions = None
+        if allowed is not None:
+            allowed_positions = {self.resources.index(resource) for resource in allowed}
+
+        parent = array("l", [-1]) * len(self.items)
+        parent[source] = source
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            for neighbour in self.indices[self.indptr[node]:self.indptr[node + 1]]:
+                if parent[neighbour] != -1:
+                    continue
+                if (
+                    neighbour != target
+                    and allowed_positions is not None
+                    and self.node_resource[neighbour] not in allowed_positions
+                ):
+                    continue
+
+                parent[neighbour] = node
+                if neighbour == target:
+                    path = [target]
+                    while path[-1] != source:
+                        path.append(parent[path[-1]])
+                    return path[::-1]
+                queue.append(neighbour)
+
+        return None
+
+    def describe(self, node: int) -> dict:
+        item = self.items[node]
+        resource = self.resource_of(node)
+        return {
+            "type": resource,
+            "id": extract_id_from_url(item["url"]),
+            "name": item.get("title") if resource == "films" else item.get("name"),
+            "url": item["url"],
+        }
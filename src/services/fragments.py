@@ -0,0 +1,123 @@
+import json
+import threading
+from typing import Callable
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+from services.dataset import current_dataset
+from services.relations import RelationGraph
+from utils.fast_json import dumps
+
+# cada recurso registra o modelo da resposta e como expandir cada campo de relação;
+# a resposta completa é serializada uma vez e guardada por geração do dataset e url
+Expander = Callable[[RelationGraph, dict], object]
+
+_MODELS: dict[str, type[BaseModel]] = {}
+_EXPANDERS: dict[str, dict[str, Expander]] = {}
+_FRAGMENTS: dict[int, dict[str, dict[str, bytes]]] = {}
+# as listagens rodam no threadpool: criar e descartar gerações passa pelo lock
+_FRAGMENTS_LOCK = threading.Lock()
+
+
+def register_fragment_builder(resource: str, model: type[BaseModel], expanders: dict[str, Expander]) -> None:
+    _MODELS[resource] = model
+    _EXPANDERS[resource] = expanders
+
+
+def _field_value(resource: str, graph: RelationGraph, item: dict, field: str, expand: set[str] | None):
+    if field == "url_id":
+        return item["url"]
+
+    expander = _EXPANDERS[resource].get(field)
+    if expander is not None and (expand is None or field in expand):
+        return expander(graph, item)
+
+    # campo simples ou relação não expandida (fica com as urls do swapi)
+    return item.get(field)
+
+
+def build_record(resource: str, item: dict) -> BaseModel:
+    graph = current_dataset().graph
+    model = _MODELS[resource]
+    return model(**{
+        field: _field_value(resource, graph, item, field, None)
+        for field in model.model_fields
+    })
+
+
+def sparse_record(resource: str, item: dict, fields: set[str] | None, expand: set[str] | None) -> dict:
+    # só monta (e só expande) os campos pedidos
+    graph = current_dataset().graph
+    return {
+        field: _field_value(resource, graph, item, field, expand)
+        for field in _MODELS[resource].model_fields
+        if fields is None or field in fields
+    }
+
+
+def check_projection(resource: str, fields: set[str] | None, expand: set[str] | None) -> None:
+    unknown = (fields or set()) - set(_MODELS[resource].model_fields)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"fields inválidos para {resource}: {', '.join(sorted(unknown))}"
+        )
+
+    unknown = (expand or set()) - set(_EXPANDERS[resource])
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"expand inválido para {resource}; opções: {', '.join(_EXPANDERS[resource])}"
+        )
+
+
+def get_fragment(
+    resource: str,
+    item: dict,
+    fields: set[str] | None = None,
+    expand: set[str] | None = None,
+) -> bytes:
+    if fields is not None or expand is not None:
+        return dumps(sparse_record(resource, item, fields, expand))
+
+    key = current_dataset().generation
+    generation = _FRAGMENTS.get(key)
+    if generation is None:
+        with _FRAGMENTS_LOCK:
+            generation = _FRAGMENTS.setdefault(key, {})
+    fragments = generation.setdefault(resource, {})
+    fragment = fragments.get(item["url"])
+
+    if fragment is None:
+        fragment = build_record(resource, item).model_dump_json().encode()
+        fragments[item["url"]] = fragment
+
+    return fragment
+
+
+def clear_fragments() -> None:
+    # descarta as gerações antigas; requisições ainda em andamento nelas
+    # continuam funcionando, só montam os fragmentos de novo
+    generation = current_dataset().generation
+    with _FRAGMENTS_LOCK:
+        for old in [key for key in _FRAGMENTS if key != generation]:
+            del _FRAGMENTS[old]
+
+
+def paginated_response(
+    resource: str,
+    page: int,
+    page_size: int,
+    total: int,
+    items: list[dict],
+    next_cursor: str | None = None,
+    fields: set[str] | None = None,
+    expand: set[str] | None = None,
+) -> Response:
+    results = b",".join(get_fragment(resource, item, fields, expand) for item in items)
+    cursor = json.dumps(next_cursor).encode()
+    body = b'{"page":%d,"page_size":%d,"total":%d,"next_cursor":%b,"results":[%b]}' % (
+        page, page_size, total, cursor, results
+    )
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,64 @@
+import functools
+import inspect
+import threading
+from typing import Callable
+
+from fastapi import Response
+
+from services.dataset import current_dataset
+from utils.fast_json import dumps
+
+# rotas de estatística cujo resultado só depende do cache: cada combinação de
+# parâmetros é calculada uma vez por geração do dataset e guardada já em JSON
+_VIEWS: dict[str, Callable] = {}
+_MATERIALIZED: dict[tuple, bytes] = {}
+# handlers síncronos gravam do threadpool enquanto o reload limpa no event loop
+_MATERIALIZED_LOCK = threading.Lock()
+
+
+def _encode(result) -> bytes:
+    return dumps(result)
+
+
+def materialized_view(handler: Callable) -> Callable:
+    name = f"{handler.__module__}.{handler.__name__}"
+    _VIEWS[name] = handler
+
+    @functools.wraps(handler)
+    def wrapper(**kwargs):
+        key = (current_dataset().generation, name, tuple(sorted(kwargs.items())))
+        body = _MATERIALIZED.get(key)
+
+        if body is None:
+            body = _encode(handler(**kwargs))
+            with _MATERIALIZED_LOCK:
+                _MATERIALIZED[key] = body
+
+        return Response(content=body, media_type="application/json")
+
+    return wrapper
+
+
+def refresh_materialized_views() -> None:
+    generation = current_dataset().generation
+
+    # as views sem parâmetros já saem calculadas do load; as demais são
+    # calculadas no primeiro acesso de cada combinação
+    for name, handler in _VIEWS.items():
+        if inspect.signature(handler).parameters:
+            continue
+        try:
+            body = _encode(handler())
+        except Exception as exc:
+            print(f"⚠️ Estatística {name} não pré-calculada: {exc!r}")
+            continue
+        with _MATERIALIZED_LOCK:
+            _MATERIALIZED[(generation, name, ())] = body
+
+
+def clear_materialized_views() -> None:
+    # só depois do swap: antes dele a geração antiga ainda está no ar
+    generation = current_dataset().generation
+    with _MATERIALIZED_LOCK:
+        for key in [key for key in _MATERIALIZED if key[0] != generation]:
+            del _MATERIALIZED[key]
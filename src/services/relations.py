@@ -0,0 +1,131 @@
+# campos de cada recurso que apontam (por url) para outro recurso
+RELATION_FIELDS: dict[str, dict[str, str]] = {
+    "people": {
+        "homeworld": "planets",
+        "films": "films",
+        "species": "species",
+        "vehicles": "vehicles",
+        "starships": "starships",
+    },
+    "planets": {
+        "residents": "people",
+        "films": "films",
+    },
+    "films": {
+        "characters": "people",
+        "planets": "planets",
+        "starships": "starships",
+        "vehicles": "vehicles",
+        "species": "species",
+    },
+    "species": {
+        "homeworld": "planets",
+        "people": "people",
+        "films": "films",
+    },
+    "starships": {
+        "pilots": "people",
+        "films": "films",
+    },
+    "vehicles": {
+        "pilots": "people",
+        "films": "films",
+    },
+}
+
+
+# grafo url -> registro com as arestas já resolvidas, montado uma vez no load_swapi_cache.
+# forward[url][campo] são os registros para onde o campo aponta;
+# reverse[url]["recurso.campo"] são os registros que apontam para url por aquele campo
+# (ex.: reverse[pessoa]["films.characters"] são os filmes da pessoa)
+class RelationGraph:
+
+    def __init__(self, cache: dict[str, list[dict]]):
+        self.by_url: dict[str, dict] = {
+            item["url"]: item
+            for items in cache.values()
+            for item in items
+            if item.get("url")
+        }
+        self.forward: dict[str, dict[str, list[dict]]] = {}
+        self.reverse: dict[str, dict[str, list[dict]]] = {}
+
+        # posição de cada registro dentro do seu recurso (mesmos ordinais dos índices)
+        self.ordinals: dict[str, int] = {
+            item["url"]: ordinal
+            for items in cache.values()
+            for ordinal, item in enumerate(items)
+            if item.get("url")
+        }
+
+        for resource, items in cache.items():
+            fields = RELATION_FIELDS.get(resource, {})
+
+            for item in items:
+                url = item.get("url")
+                edges = self.forward.setdefault(url, {})
+
+                for field in fields:
+                    targets = [
+                        self.by_url[target]
+                        for target in as_urls(item.get(field))
+                        if target in self.by_url
+                    ]
+                    edges[field] = targets
+
+                    for target in targets:
+                        self.reverse.setdefault(target["url"], {}).setdefault(
+                            f"{resource}.{field}", []
+                        ).append(item)
+
+    def get(self, url: str | None) -> dict | None:
+        return self.by_url.get(url)
+
+    def related(self, item: dict, field: str) -> list[dict]:
+        return self.forward.get(item.get("url"), {}).get(field, [])
+
+    def related_one(self, item: dict, field: str) -> dict | None:
+        targets = self.related(item, field)
+        return targets[0] if targets else None
+
+    def referencing(self, resource: str, path: tuple[str, ...], targets: list[dict]) -> set[int]:
+        # ordinais de `resource` que alcançam algum dos targets seguindo `path`;
+        # percorre o caminho de trás para frente pelas listas reversas, então
+        # cada salto custa o grau dos registros visitados, não o tamanho do recurso
+        chain = resource_chain(resource, path)
+        current = {item["url"]: item for item in targets}
+
+        for source, field in reversed(list(zip(chain, path))):
+            key = f"{source}.{field}"
+            current = {
+                item["url"]: item
+                for target in current
+                for item in self.reverse.get(target, {}).get(key, [])
+            }
+
+        return {self.ordinals[url] for url in current}
+
+
+def resource_chain(resource: str, path: tuple[str, ...]) -> list[str]:
+    # recursos visitados ao seguir o caminho (ex.: people + species.homeworld -> people, species, planets)
+    chain = [resource]
+    for field in path:
+        target = RELATION_FIELDS.get(chain[-1], {}).get(field)
+        if target is None:
+            raise ValueError(f"{chain[-1]} não tem a relação {field}")
+        chain.append(target)
+    return chain
+
+
+def extract_id_from_url(url: str | None) -> int:
+    if not url:
+        return 0
+    return int(url.rstrip("/").split("/")[-1])
+
+
+def as_urls(value) -> list[str]:
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return value
@@ -0,0 +1,126 @@
+import functools
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from fastapi import Response
+from pydantic import BaseModel
+
+from services.dataset import current_dataset
+
+# respostas prontas das listagens, guardadas em bytes por geração do dataset e
+# request normalizado; o limite é pelo tamanho total dos corpos guardados
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# parâmetros que diferenciam maiúsculas de minúsculas
+_CASE_SENSITIVE = {"cursor", "order_by", "order_dir", "fields", "expand", "filter"}
+
+
+# as listagens são handlers síncronos e rodam em paralelo no threadpool, então
+# todo acesso ao OrderedDict (inclusive o move_to_end da leitura) passa pelo lock
+class ResponseCache:
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: OrderedDict[tuple, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> bytes | None:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+
+            self._entries[key] = body
+            self.size += len(body)
+
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def discard_generations_except(self, generation: int) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] != generation]:
+                self.size -= len(self._entries.pop(key))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_RESPONSES = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+
+
+def canonical_request(model: BaseModel) -> tuple:
+    # filtros de texto não diferenciam maiúsculas; parâmetros vazios ficam de fora
+    items = []
+    for field, value in model.model_dump(mode="json").items():
+        if value is None:
+            continue
+        if isinstance(value, str) and field not in _CASE_SENSITIVE:
+            value = value.lower()
+        if isinstance(value, list):
+            value = tuple(value)
+        items.append((field, value))
+    return tuple(sorted(items))
+
+
+def cached_response(handler: Callable) -> Callable:
+    name = f"{handler.__module__}.{handler.__name__}"
+
+    @functools.wraps(handler)
+    def wrapper(**kwargs):
+        key = (
+            current_dataset().generation,
+            name,
+            tuple(sorted(
+                (arg, canonical_request(value) if isinstance(value, BaseModel) else value)
+                for arg, value in kwargs.items()
+            )),
+        )
+        body = _RESPONSES.get(key)
+
+        if body is None:
+            body = handler(**kwargs).body
+            _RESPONSES.set(key, body)
+
+        return Response(content=body, media_type="application/json")
+
+    return wrapper
+
+
+def clear_response_cache() -> None:
+    # respostas de gerações antigas nunca mais são servidas
+    _RESPONSES.discard_generations_except(current_dataset().generation)
+
+
+def get_response_cache_stats() -> dict:
+    return _RESPONSES.stats()
@@ -0,0 +1,90 @@
+import argparse
+import asyncio
+import marshal
+import os
+import struct
+import time
+import zlib
+
+# cabeçalho: magic, versão do formato, versão do marshal, crc32 e tamanho do payload
+SNAPSHOT_MAGIC = b"SWAPISNP"
+SNAPSHOT_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQ")
+
+DEFAULT_SNAPSHOT_PATH = "swapi_snapshot.bin"
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def dump_snapshot(cache: dict[str, list[dict]], path: str) -> int:
+    payload = marshal.dumps({resource: list(items) for resource, items in cache.items()})
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC,
+        SNAPSHOT_VERSION,
+        marshal.version,
+        zlib.crc32(payload),
+        len(payload),
+    )
+
+    # escreve num arquivo temporário e troca de uma vez, para nunca deixar um snapshot pela metade
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+    return _HEADER.size + len(payload)
+
+
+def load_snapshot(path: str) -> dict[str, list[dict]]:
+    with open(path, "rb") as f:
+        raw = f.read()
+
+    if len(raw) < _HEADER.size:
+        raise SnapshotError("snapshot truncado")
+
+    magic, version, marshal_version, checksum, size = _HEADER.unpack_from(raw)
+
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("arquivo não é um snapshot da SWAPI")
+    if version != SNAPSHOT_VERSION or marshal_version != marshal.version:
+        raise SnapshotError(f"versão de snapshot incompatível ({version}/{marshal_version})")
+
+    payload = memoryview(raw)[_HEADER.size:]
+    if len(payload) != size or zlib.crc32(payload) != checksum:
+        raise SnapshotError("checksum do snapshot inválido")
+
+    data = marshal.loads(payload)
+    if not isinstance(data, dict):
+        raise SnapshotError("conteúdo do snapshot inválido")
+    return data
+
+
+def main() -> None:
+    from services.swapi_client import close_swapi_client
+    from services.swapi_services import load_swapi_cache
+
+    parser = argparse.ArgumentParser(description="Atualiza o snapshot local do cache da SWAPI")
+    parser.add_argument(
+        "--output",
+        default=os.getenv("SWAPI_SNAPSHOT_PATH", DEFAULT_SNAPSHOT_PATH),
+        help="caminho do arquivo de snapshot",
+    )
+    args = parser.parse_args()
+
+    async def refresh():
+        try:
+            return await load_swapi_cache()
+        finally:
+            await close_swapi_client()
+
+    start = time.perf_counter()
+    dataset = asyncio.run(refresh())
+    size = dump_snapshot(dataset.cache, args.output)
+    print(f"✅ Snapshot salvo em {args.output} ({size} bytes, {time.perf_counter() - start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import random
+import time
+
+import httpx
+
+SWAPI_DEFAULT_URL = "https://swapi.dev/api"
+
+# SWAPI_BASE_URL permite apontar o cliente para outro servidor (ex.: um stub local nos testes)
+SWAPI_BASE_URL = os.getenv("SWAPI_BASE_URL", SWAPI_DEFAULT_URL).rstrip("/")
+SWAPI_TIMEOUT = float(os.getenv("SWAPI_TIMEOUT", "10"))
+SWAPI_MAX_CONCURRENCY = int(os.getenv("SWAPI_MAX_CONCURRENCY", "20"))
+SWAPI_RETRIES = int(os.getenv("SWAPI_RETRIES", "3"))
+
+
+class UpstreamUnavailable(Exception):
+    pass
+
+
+class _RetryableStatus(Exception):
+    pass
+
+
+# abre depois de `failure_threshold` falhas seguidas; enquanto aberto as chamadas
+# falham na hora e, passado `reset_timeout`, uma única chamada de teste é
+# liberada: ela reabre a janela, então as demais continuam falhando até o
+# resultado dela fechar o circuito ou até a janela vencer de novo
+class CircuitBreaker:
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "open":
+            return False
+        if state == "half-open":
+            self.opened_at = time.monotonic()
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.state == "half-open":
+            self.opened_at = time.monotonic()
+
+
+class SwapiClient:
+
+    def __init__(
+        self,
+        base_url: str = SWAPI_BASE_URL,
+        timeout: float = SWAPI_TIMEOUT,
+        max_concurrency: int = SWAPI_MAX_CONCURRENCY,
+        retries: int = SWAPI_RETRIES,
+        backoff: float = 0.2,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker = CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            follow_redirects=True,
+            transport=transport,
+        )
+
+    def url_for(self, path_or_url: str) -> str:
+        # as urls dentro dos dados sempre apontam para o swapi.dev
+        if path_or_url.startswith(SWAPI_DEFAULT_URL):
+            path_or_url = path_or_url[len(SWAPI_DEFAULT_URL):]
+        if path_or_url.startswith("http"):
+            return path_or_url
+        return f"{self.base_url}/{path_or_url.lstrip('/')}"
+
+    async def get(self, path_or_url: str, params: dict | None = None) -> httpx.Response:
+        url = self.url_for(path_or_url)
+
+        for attempt in range(self.retries + 1):
+            if not self.breaker.allow():
+                raise UpstreamUnavailable(f"circuito aberto para {self.base_url}")
+
+            try:
+                async with self._semaphore:
+                    response = await self._client.get(url, params=params)
+                if response.status_code >= 500:
+                    raise _RetryableStatus(f"{response.status_code} em {url}")
+            except (httpx.TimeoutException, httpx.TransportError, _RetryableStatus) as exc:
+                self.breaker.record_failure()
+                if attempt == self.retries:
+                    raise UpstreamUnavailable(f"falha ao buscar {url}: {exc!r}") from exc
+
+                # backoff exponencial com jitter completo
+                await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+                continue
+
+            self.breaker.record_success()
+            return response
+
+        raise UpstreamUnavailable(f"falha ao buscar {url}")
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_CLIENT: SwapiClient | None = None
+
+
+def get_swapi_client() -> SwapiClient:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = SwapiClient()
+    return _CLIENT
+
+
+async def close_swapi_client() -> None:
+    global _CLIENT
+    if _CLIENT is not None:
+        await _CLIENT.aclose()
+        _CLIENT = None
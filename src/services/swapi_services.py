@@ -1,54 +1,272 @@
-import requests
-_URL_CACHE: dict[str, dict] = {}
+import asyncio
+import math
+import os
+import time
 
+from services.cache import FRESH, TTLCache
+from services.dataset import RESOURCES, Dataset, current_dataset, live_dataset, pinned_dataset, swap_dataset
+from services.cooccurrence import CoOccurrence
+from services.entity_graph import EntityGraph
+from services.fragments import clear_fragments
+from services.materialized import clear_materialized_views, refresh_materialized_views
+from services.relations import RelationGraph
+from services.response_cache import clear_response_cache, get_response_cache_stats
+from services.snapshot import SnapshotError, load_snapshot
+from services.swapi_client import SWAPI_DEFAULT_URL, SwapiClient, get_swapi_client
+from utils.columns import NumericColumn
+from utils.ordering import Ordering
+from utils.text_index import TextIndex
 
-SWAPI_CACHE: dict[str, list[dict]] = {
-    "people": [],
-    "planets": [],
-    "films": [],
-    "species": [],
-    "starships": [],
-    "vehicles": [],
-}
+# por quanto tempo o dataset carregado é considerado atual; depois disso segue
+# sendo servido enquanto é recarregado em background
+SWAPI_DATASET_TTL = float(os.getenv("SWAPI_DATASET_TTL", "86400"))
 
-def fetch_data(resource: str) -> list[dict]:
-    return SWAPI_CACHE.get(resource, [])
+# registros buscados um a um no swapi (ids fora do dataset, urls avulsas)
+SWAPI_URL_CACHE_SIZE = int(os.getenv("SWAPI_URL_CACHE_SIZE", "1024"))
+SWAPI_URL_CACHE_TTL = float(os.getenv("SWAPI_URL_CACHE_TTL", "3600"))
+SWAPI_URL_CACHE_STALE_TTL = float(os.getenv("SWAPI_URL_CACHE_STALE_TTL", "600"))
 
-def _fetch_all_pages(resource: str) -> list[dict]:
-    url = f"https://swapi.dev/api/{resource}/"
-    results: list[dict] = []
+_URL_CACHE = TTLCache(SWAPI_URL_CACHE_SIZE, SWAPI_URL_CACHE_TTL, SWAPI_URL_CACHE_STALE_TTL)
 
-    while url:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+# buscas ao swapi em andamento por chave: misses concorrentes da mesma chave
+# aguardam a mesma task em vez de abrir outra chamada (single-flight)
+_IN_FLIGHT: dict[str, asyncio.Task] = {}
+SINGLE_FLIGHT_STATS = {"upstream_calls": 0, "coalesced": 0}
+
+
+# uma entrada por recurso; nunca expira de vez, só fica velha e é recarregada
+_DATASET_CACHE = TTLCache(len(RESOURCES), SWAPI_DATASET_TTL, stale_ttl=math.inf)
+_RELOAD_TASK: asyncio.Task | None = None
+_RELOAD_LOCK = asyncio.Lock()
+
+# recarga periódica completa do dataset (0 desliga)
+SWAPI_RELOAD_INTERVAL = float(os.getenv("SWAPI_RELOAD_INTERVAL", "0"))
+
+
+def fetch_data(resource: str) -> tuple[dict, ...]:
+    return current_dataset().cache.get(resource, ())
+
+
+def get_relation_graph() -> RelationGraph:
+    return current_dataset().graph
+
+
+def get_entity_graph() -> EntityGraph:
+    return current_dataset().entity_graph
+
+
+def get_cooccurrence() -> CoOccurrence:
+    return current_dataset().cooccurrence
+
+
+def get_text_index(resource: str) -> TextIndex | None:
+    return current_dataset().text_indexes.get(resource)
+
+
+def get_ordering(resource: str) -> Ordering:
+    return current_dataset().orderings[resource]
 
+
+def get_numeric_column(resource: str, field: str) -> NumericColumn:
+    return current_dataset().numeric_columns[resource][field]
+
+
+def get_numeric_columns(resource: str) -> dict[str, NumericColumn]:
+    return current_dataset().numeric_columns.get(resource, {})
+
+
+async def _fetch_page(client: SwapiClient, url: str, page: int | None = None) -> dict:
+    params = {"page": page} if page else None
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+async def _fetch_all_pages(client: SwapiClient, resource: str) -> list[dict]:
+    url = f"{resource}/"
+
+    first = await _fetch_page(client, url)
+    results: list[dict] = list(first.get("results", []))
+
+    if not first.get("next") or not results:
+        return results
+
+    # a primeira página revela o count, então as demais saem em paralelo
+    total_pages = math.ceil(first.get("count", 0) / len(results))
+    pages = await asyncio.gather(*(
+        _fetch_page(client, url, page)
+        for page in range(2, total_pages + 1)
+    ))
+
+    for data in pages:
         results.extend(data.get("results", []))
-        url = data.get("next")
 
     return results
 
 
-def load_swapi_cache() -> None:
-    for resource in SWAPI_CACHE:
-        if not SWAPI_CACHE[resource]:  # só carrega se estiver vazio
-            SWAPI_CACHE[resource] = _fetch_all_pages(resource)
+async def _load_resource(client: SwapiClient, resource: str) -> tuple[dict, ...]:
+    start = time.perf_counter()
+    items = tuple(await _fetch_all_pages(client, resource))
+    elapsed = time.perf_counter() - start
+    print(f"   {resource}: {len(items)} registros em {elapsed:.2f}s")
+    return items
 
 
-def fetch_data_by_id(resource, id):
-    url = f"https://swapi.dev/api/{resource}/{id}"
-    response = requests.get(url)
-    return response.json()
+def _load_from_snapshot(path: str) -> None:
+    start = time.perf_counter()
+    try:
+        snapshot = load_snapshot(path)
+    except (OSError, SnapshotError) as exc:
+        print(f"⚠️ Snapshot {path} ignorado: {exc}")
+        return
+
+    for resource in RESOURCES:
+        items = tuple(snapshot.get(resource, ()))
+        if items and _DATASET_CACHE.state(resource) != FRESH:
+            _DATASET_CACHE.set(resource, items)
+
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"   snapshot {path} carregado em {elapsed:.1f}ms")
+
+
+async def load_swapi_cache(snapshot_path: str | None = None, force: bool = False) -> Dataset:
+    # monta a próxima geração inteira por fora e só então troca a referência:
+    # se algum recurso falhar nada muda e as rotas seguem com a geração atual
+    async with _RELOAD_LOCK:
+        if snapshot_path:
+            _load_from_snapshot(snapshot_path)
+
+        pending = [
+            resource for resource in RESOURCES
+            if force or _DATASET_CACHE.state(resource) != FRESH  # só carrega o que venceu
+        ]
+
+        if pending:
+            client = get_swapi_client()
+            loaded = await asyncio.gather(*(
+                _load_resource(client, resource) for resource in pending
+            ))
+            for resource, items in zip(pending, loaded):
+                _DATASET_CACHE.set(resource, items)
+
+        # a requisição que dispara o reload pode estar fixada numa geração que
+        # outro reload já substituiu: a próxima sai sempre da geração no ar
+        current = live_dataset()
+        dataset = Dataset(
+            {resource: _DATASET_CACHE.get(resource, current.cache[resource]) for resource in RESOURCES},
+            generation=current.generation + 1,
+        )
+
+        # estatísticas da nova geração calculadas antes de ela entrar no ar
+        with pinned_dataset(dataset):
+            refresh_materialized_views()
+        swap_dataset(dataset)
+
+        with pinned_dataset(dataset):
+            clear_materialized_views()
+            clear_fragments()
+            clear_response_cache()
+
+        return dataset
+
+
+async def _reload_in_background(force: bool = False) -> None:
+    start = time.perf_counter()
+    try:
+        await load_swapi_cache(force=force)
+    except Exception as exc:
+        print(f"⚠️ Falha ao recarregar o cache da SWAPI: {exc!r}")
+        return
+    print(f"✅ Cache da SWAPI recarregado em {time.perf_counter() - start:.2f}s")
+
+
+def revalidate_swapi_cache() -> None:
+    # stale-while-revalidate do dataset: as rotas seguem com os dados atuais
+    # enquanto os recursos vencidos são recarregados em background
+    global _RELOAD_TASK
+    if _RELOAD_TASK is not None and not _RELOAD_TASK.done():
+        return
+    if all(_DATASET_CACHE.state(resource) == FRESH for resource in RESOURCES):
+        return
+    _RELOAD_TASK = asyncio.ensure_future(_reload_in_background())
+
+
+async def _single_flight(key: str, fetch):
+    task = _IN_FLIGHT.get(key)
+
+    if task is not None:
+        SINGLE_FLIGHT_STATS["coalesced"] += 1
+    else:
+        SINGLE_FLIGHT_STATS["upstream_calls"] += 1
+        task = asyncio.ensure_future(fetch())
+        _IN_FLIGHT[key] = task
+        task.add_done_callback(lambda _: _IN_FLIGHT.pop(key, None))
+
+    # shield: se um dos clientes desistir, a busca continua para os demais
+    return await asyncio.shield(task)
+
+
+def get_upstream_metrics() -> dict:
+    return {
+        **SINGLE_FLIGHT_STATS,
+        "in_flight": len(_IN_FLIGHT),
+        "circuit_breaker": get_swapi_client().breaker.state,
+    }
+
+
+def get_cache_metrics() -> dict:
+    return {
+        "dataset": _DATASET_CACHE.stats(),
+        "urls": _URL_CACHE.stats(),
+        "responses": get_response_cache_stats(),
+    }
+
+
+def _is_record(data) -> bool:
+    # só guarda registros de verdade, nunca respostas de erro como {"detail": "Not found"}
+    return isinstance(data, dict) and "url" in data
+
+
+async def reload_swapi_cache() -> Dataset:
+    return await load_swapi_cache(force=True)
+
+
+async def run_periodic_reload(interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await _reload_in_background(force=True)
+
+
+def get_dataset_info(dataset: Dataset | None = None) -> dict:
+    dataset = dataset or current_dataset()
+    return {
+        "generation": dataset.generation,
+        "fingerprint": dataset.fingerprint,
+        "loaded_at": dataset.loaded_at,
+        "counts": dataset.counts(),
+    }
+
+
+async def fetch_data_by_id(resource, id):
+    index = current_dataset().id_index.get(resource, {})
+    if id in index:
+        return index[id]
+
+    # miss: busca no swapi; a chave é a própria url do registro, então
+    # fetch_by_url reaproveita a mesma entrada
+    url = f"{SWAPI_DEFAULT_URL}/{resource}/{id}/"
+
+    async def fetch():
+        response = await get_swapi_client().get(url)
+        return response.json()
+
+    return await _URL_CACHE.get_or_load(url, lambda: _single_flight(url, fetch), _is_record)
 
 
-def fetch_by_url(url: str) -> dict:
-    if url not in _URL_CACHE:
-        response = requests.get(url)
+async def fetch_by_url(url: str) -> dict:
+    async def fetch():
+        response = await get_swapi_client().get(url)
         response.raise_for_status()
-        _URL_CACHE[url] = response.json()
-    return _URL_CACHE[url]
+        return response.json()
 
-def extract_id_from_url(url: str | None) -> int:
-    if not url:
-        return 0
-    return int(url.rstrip("/").split("/")[-1])
+    return await _URL_CACHE.get_or_load(url, lambda: _single_flight(url, fetch))
@@ -0,0 +1,93 @@
+import pytest
+
+from services.dataset import Dataset
+
+API = "https://swapi.dev/api"
+
+
+def _urls(resource: str, *ids: int) -> list[str]:
+    return [f"{API}/{resource}/{id}/" for id in ids]
+
+
+def _url(resource: str, id: int) -> str:
+    return f"{API}/{resource}/{id}/"
+
+
+# um swapi em miniatura: poucos registros, mas com as relações nos dois sentidos
+def swapi_cache() -> dict[str, tuple[dict, ...]]:
+    return {
+        "people": (
+            {"name": "Luke Skywalker", "gender": "male", "height": "172", "mass": "77",
+             "homeworld": _url("planets", 1), "films": _urls("films", 1, 2),
+             "species": _urls("species", 1), "starships": _urls("starships", 1),
+             "vehicles": _urls("vehicles", 1), "url": _url("people", 1)},
+            {"name": "Leia Organa", "gender": "female", "height": "150", "mass": "49",
+             "homeworld": _url("planets", 2), "films": _urls("films", 1, 2),
+             "species": _urls("species", 1), "starships": [], "vehicles": [],
+             "url": _url("people", 2)},
+            {"name": "Padmé Amidala", "gender": "female", "height": "185", "mass": "45",
+             "homeworld": _url("planets", 3), "films": _urls("films", 3),
+             "species": _urls("species", 1), "starships": [], "vehicles": [],
+             "url": _url("people", 3)},
+            {"name": "Jar Jar Binks", "gender": "male", "height": "196", "mass": "66",
+             "homeworld": _url("planets", 4), "films": _urls("films", 3),
+             "species": _urls("species", 2), "starships": [], "vehicles": [],
+             "url": _url("people", 4)},
+            {"name": "R2-D2", "gender": "n/a", "height": "96", "mass": "32",
+             "homeworld": _url("planets", 1), "films": _urls("films", 1, 2, 3),
+             "species": _urls("species", 3), "starships": [], "vehicles": [],
+             "url": _url("people", 5)},
+        ),
+        "planets": (
+            {"name": "Tatooine", "climate": "arid", "population": "200000",
+             "residents": _urls("people", 1, 5), "films": _urls("films", 1, 2),
+             "url": _url("planets", 1)},
+            {"name": "Alderaan", "climate": "temperate", "population": "2000000000",
+             "residents": _urls("people", 2), "films": _urls("films", 1),
+             "url": _url("planets", 2)},
+            {"name": "Naboo", "climate": "temperate", "population": "4500000000",
+             "residents": _urls("people", 3), "films": _urls("films", 3),
+             "url": _url("planets", 3)},
+            {"name": "Naboo Moon", "climate": "unknown", "population": "unknown",
+             "residents": _urls("people", 4), "films": _urls("films", 3),
+             "url": _url("planets", 4)},
+        ),
+        "films": (
+            {"title": "A New Hope", "episode_id": 4, "director": "George Lucas",
+             "characters": _urls("people", 1, 2, 5), "planets": _urls("planets", 1, 2),
+             "starships": _urls("starships", 1), "vehicles": [],
+             "species": _urls("species", 1, 3), "url": _url("films", 1)},
+            {"title": "The Empire Strikes Back", "episode_id": 5, "director": "Irvin Kershner",
+             "characters": _urls("people", 1, 2, 5), "planets": _urls("planets", 1),
+             "starships": [], "vehicles": _urls("vehicles", 1),
+             "species": _urls("species", 1, 3), "url": _url("films", 2)},
+            {"title": "The Phantom Menace", "episode_id": 1, "director": "George Lucas",
+             "characters": _urls("people", 3, 4, 5), "planets": _urls("planets", 3, 4),
+             "starships": [], "vehicles": [],
+             "species": _urls("species", 1, 2, 3), "url": _url("films", 3)},
+        ),
+        "species": (
+            {"name": "Human", "classification": "mammal", "homeworld": _url("planets", 3),
+             "people": _urls("people", 1, 2, 3), "films": _urls("films", 1, 2, 3),
+             "url": _url("species", 1)},
+            {"name": "Gungan", "classification": "amphibian", "homeworld": _url("planets", 4),
+             "people": _urls("people", 4), "films": _urls("films", 3),
+             "url": _url("species", 2)},
+            {"name": "Droid", "classification": "artificial", "homeworld": None,
+             "people": _urls("people", 5), "films": _urls("films", 1, 2, 3),
+             "url": _url("species", 3)},
+        ),
+        "starships": (
+            {"name": "X-wing", "MGLT": "100", "pilots": _urls("people", 1),
+             "films": _urls("films", 1), "url": _url("starships", 1)},
+        ),
+        "vehicles": (
+            {"name": "Snowspeeder", "pilots": _urls("people", 1),
+             "films": _urls("films", 2), "url": _url("vehicles", 1)},
+        ),
+    }
+
+
+@pytest.fixture
+def dataset() -> Dataset:
+    return Dataset(swapi_cache(), generation=1)
@@ -0,0 +1,24 @@
+from utils.bitsets import all_bits, from_mask, from_ordinals, iter_bits, to_mask
+
+
+def test_ordinals_round_trip():
+    ordinals = {0, 3, 8, 9, 63, 64, 99}
+    bits = from_ordinals(ordinals, 100)
+
+    assert bits == sum(1 << i for i in ordinals)
+    assert bits.bit_count() == len(ordinals)
+    assert list(iter_bits(bits)) == sorted(ordinals)
+
+
+def test_mask_has_one_byte_per_record():
+    bits = from_ordinals([1, 4], 6)
+
+    assert to_mask(bits, 6) == b"\x00\x01\x00\x00\x01\x00"
+    assert from_mask(to_mask(bits, 6)) == bits
+
+
+def test_empty_and_full_sets():
+    assert from_ordinals([], 10) == 0
+    assert list(iter_bits(0)) == []
+    assert to_mask(0, 3) == b"\x00\x00\x00"
+    assert to_mask(all_bits(5), 5) == b"\x01" * 5
@@ -0,0 +1,76 @@
+import asyncio
+
+from services.cache import FRESH, MISS, STALE, TTLCache
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "a" passa a ser o mais recente
+    cache.set("c", 3)
+
+    assert cache.state("b") == MISS
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def _state_after_set(cache: TTLCache) -> str:
+    cache.set("key", "value")
+    return cache.state("key")
+
+
+def test_entry_states_follow_ttl_and_stale_ttl():
+    # ttl=0 deixa a entrada velha na hora; sem stale_ttl ela já expirou
+    assert _state_after_set(TTLCache(4, ttl=60)) == FRESH
+    assert _state_after_set(TTLCache(4, ttl=0, stale_ttl=60)) == STALE
+    assert _state_after_set(TTLCache(4, ttl=0)) == MISS
+
+
+def test_stale_value_is_served_while_one_refresh_runs_in_background():
+    cache = TTLCache(4, ttl=0, stale_ttl=60)
+    cache.set("key", "old")
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0)
+        return "new"
+
+    async def scenario():
+        served = [await cache.get_or_load("key", loader) for _ in range(3)]
+        await asyncio.gather(*cache._refreshing.values())
+        return served
+
+    assert asyncio.run(scenario()) == ["old", "old", "old"]
+    assert len(calls) == 1
+    assert cache.pop("key") == "new"
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_failed_refresh_keeps_the_stale_value():
+    cache = TTLCache(4, ttl=0, stale_ttl=60)
+    cache.set("key", "old")
+
+    async def loader():
+        raise RuntimeError("swapi fora do ar")
+
+    async def scenario():
+        value = await cache.get_or_load("key", loader)
+        await asyncio.gather(*cache._refreshing.values())
+        return value
+
+    assert asyncio.run(scenario()) == "old"
+    assert cache.get("key") == "old"
+    assert cache.stats()["refresh_errors"] == 1
+
+
+def test_uncacheable_values_are_returned_but_not_stored():
+    cache = TTLCache(4, ttl=60)
+
+    async def loader():
+        return {"detail": "Not found"}
+
+    value = asyncio.run(cache.get_or_load("key", loader, cacheable=lambda value: "url" in value))
+    assert value == {"detail": "Not found"}
+    assert cache.state("key") == MISS
@@ -0,0 +1,27 @@
+def _names(dataset, resource: str, ordinals) -> list[str]:
+    return [dataset.cache[resource][i]["name"] for i in ordinals]
+
+
+def test_in_all_films_intersects_the_film_columns(dataset):
+    cooccurrence = dataset.cooccurrence
+    assert _names(dataset, "people", cooccurrence.in_all_films("people", [0, 1])) == [
+        "Luke Skywalker", "Leia Organa", "R2-D2",
+    ]
+    assert _names(dataset, "people", cooccurrence.in_all_films("people", [0, 1, 2])) == ["R2-D2"]
+    assert _names(dataset, "species", cooccurrence.in_all_films("species", [2])) == ["Human", "Gungan", "Droid"]
+    assert cooccurrence.in_all_films("starships", [1]) == []
+
+
+def test_similar_ranks_by_jaccard_then_shared_films(dataset):
+    cooccurrence = dataset.cooccurrence
+    # Luke: {1, 2}. Leia: {1, 2} -> 1.0; R2-D2: {1, 2, 3} -> 2/3; Padmé e Jar Jar não dividem filmes
+    assert cooccurrence.similar("people", 0, 5) == [(1, 1.0, 2), (4, 2 / 3, 2)]
+    # R2-D2: empate em 2/3 decidido pelo ordinal, Padmé e Jar Jar ficam com 1/3
+    assert cooccurrence.similar("people", 4, 3) == [(0, 2 / 3, 2), (1, 2 / 3, 2), (2, 1 / 3, 1)]
+
+
+def test_shared_films_are_film_ordinals(dataset):
+    cooccurrence = dataset.cooccurrence
+    assert cooccurrence.shared_films("people", 0, 4) == [0, 1]
+    assert cooccurrence.shared_films("people", 0, 2) == []
+    assert cooccurrence.shared_films("species", 1, 2) == [2]
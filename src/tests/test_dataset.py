@@ -0,0 +1,45 @@
+import asyncio
+
+import pytest
+
+from services import swapi_services
+from services.dataset import Dataset, current_dataset, live_dataset, pinned_dataset, swap_dataset
+from tests.conftest import swapi_cache
+
+
+@pytest.fixture
+def loaded_cache():
+    # dataset já fresco no cache: o load monta a geração sem ir ao swapi
+    previous = live_dataset()
+    for resource, items in swapi_cache().items():
+        swapi_services._DATASET_CACHE.set(resource, items)
+    try:
+        yield
+    finally:
+        swapi_services._DATASET_CACHE.clear()
+        swap_dataset(previous)
+
+
+def test_pinned_dataset_survives_a_swap():
+    old = Dataset(swapi_cache(), generation=1)
+    swap_dataset(old)
+    new = Dataset(swapi_cache(), generation=2)
+
+    with pinned_dataset():
+        swap_dataset(new)
+        assert current_dataset() is old
+        assert live_dataset() is new
+    assert current_dataset() is new
+
+
+def test_reload_numbers_from_the_live_generation(loaded_cache):
+    # um reload em background já trocou para a geração 5 enquanto a requisição
+    # de admin seguia fixada na 4: a próxima tem de ser a 6, não outra 5
+    stale = Dataset(swapi_cache(), generation=4)
+    swap_dataset(Dataset(swapi_cache(), generation=5))
+
+    with pinned_dataset(stale):
+        reloaded = asyncio.run(swapi_services.load_swapi_cache())
+
+    assert reloaded.generation == 6
+    assert live_dataset() is reloaded
@@ -0,0 +1,53 @@
+import pytest
+
+from services.entity_graph import EntityGraph
+from tests.conftest import swapi_cache
+
+
+@pytest.fixture(scope="module")
+def graph() -> EntityGraph:
+    return EntityGraph(swapi_cache())
+
+
+def _names(graph: EntityGraph, nodes) -> list[str]:
+    return [graph.describe(node)["name"] for node in nodes]
+
+
+def test_nodes_are_contiguous_per_resource(graph):
+    assert len(graph) == 17
+    assert graph.node("people", 1) == graph.offsets["people"]
+    assert graph.node("planets", 3) == graph.offsets["planets"] + 2
+    assert graph.node("people", 99) is None
+    assert graph.describe(graph.node("films", 3)) == {
+        "type": "films", "id": 3, "name": "The Phantom Menace",
+        "url": "https://swapi.dev/api/films/3/",
+    }
+
+
+def test_follow_keeps_discovery_order_without_repeats(graph):
+    people = [graph.node("people", 1), graph.node("people", 3), graph.node("people", 5)]
+    assert _names(graph, graph.follow(people, "films")) == [
+        "A New Hope", "The Empire Strikes Back", "The Phantom Menace",
+    ]
+    films = graph.follow([graph.node("people", 4)], "films")
+    assert _names(graph, graph.follow(films, "characters")) == ["Padmé Amidala", "Jar Jar Binks", "R2-D2"]
+    # homeworld nulo não vira aresta
+    assert graph.follow([graph.node("species", 3)], "homeworld") == []
+
+
+def test_shortest_path_ignores_edge_direction(graph):
+    leia, padme = graph.node("people", 2), graph.node("people", 3)
+    assert _names(graph, graph.shortest_path(leia, padme)) == ["Leia Organa", "Human", "Padmé Amidala"]
+    assert graph.shortest_path(leia, leia) == [leia]
+
+
+def test_allowed_restricts_intermediate_nodes(graph):
+    leia, padme = graph.node("people", 2), graph.node("people", 3)
+    assert _names(graph, graph.shortest_path(leia, padme, allowed={"films", "people"})) == [
+        "Leia Organa", "A New Hope", "R2-D2", "The Phantom Menace", "Padmé Amidala",
+    ]
+    # o alvo não precisa estar em `allowed`, mas sem intermediários não há caminho
+    assert graph.shortest_path(leia, padme, allowed={"planets"}) is None
+    assert _names(graph, graph.shortest_path(leia, graph.node("planets", 2), allowed=set())) == [
+        "Leia Organa", "Alderaan",
+    ]
@@ -0,0 +1,35 @@
+from services.dataset import Dataset
+from tests.conftest import swapi_cache
+from utils.etag import etag_for, etag_matches, is_cacheable
+
+
+def test_dataset_routes_are_cacheable():
+    assert is_cacheable("GET", "/people/list_people_by_filters")
+    assert is_cacheable("GET", "/stats/people")
+    assert not is_cacheable("POST", "/people/list_people_by_filters")
+
+
+def test_routes_served_from_upstream_are_not_cacheable():
+    # by-id e batch podem responder com erros transitórios do swapi
+    assert not is_cacheable("GET", "/people/by-id/1")
+    assert not is_cacheable("GET", "/starships/batch")
+    assert not is_cacheable("GET", "/batch")
+    assert not is_cacheable("GET", "/admin/dataset")
+
+
+def test_etag_ignores_query_order_and_changes_with_content():
+    etag = etag_for("abc", "/people/list_people_by_filters", [("page", "2"), ("name", "luke")])
+    assert etag == etag_for("abc", "/people/list_people_by_filters", [("name", "luke"), ("page", "2")])
+    assert etag != etag_for("def", "/people/list_people_by_filters", [("name", "luke"), ("page", "2")])
+    assert etag_matches(f'W/{etag}, "outro"', etag)
+
+
+def test_fingerprint_follows_content_not_generation():
+    # cada instância conta gerações por conta própria; o ETag não pode depender disso
+    fresh_instance = Dataset(swapi_cache(), generation=1)
+    reloaded_instance = Dataset(swapi_cache(), generation=2)
+    assert fresh_instance.fingerprint == reloaded_instance.fingerprint
+
+    changed = swapi_cache()
+    changed["people"] = changed["people"][:-1]
+    assert Dataset(changed, generation=1).fingerprint != fresh_instance.fingerprint
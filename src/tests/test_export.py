@@ -0,0 +1,37 @@
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import routers.films  # noqa: F401 (registra o modelo de resposta dos filmes)
+from routers.export import _ndjson_lines, export_resource
+from schemas.types_class import Types
+from services.dataset import pinned_dataset
+
+
+def _export(dataset, expand: bool, fields: set[str] | None) -> list[dict]:
+    with pinned_dataset(dataset):
+        return [json.loads(line) for line in _ndjson_lines("films", dataset.cache["films"], None, expand, fields)]
+
+
+@pytest.mark.parametrize("expand", [False, True])
+def test_both_modes_honor_the_same_projection(dataset, expand):
+    records = _export(dataset, expand, {"title", "created", "url", "url_id"})
+
+    assert [set(record) for record in records] == [{"title", "created", "url", "url_id"}] * 3
+    assert records[0]["url"] == records[0]["url_id"] == "https://swapi.dev/api/films/1/"
+
+
+def test_expand_resolves_relations_only_when_asked(dataset):
+    raw = _export(dataset, False, {"characters"})[0]["characters"]
+    expanded = _export(dataset, True, {"characters"})[0]["characters"]
+
+    assert raw[0] == "https://swapi.dev/api/people/1/"
+    assert expanded[0]["name"] == "Luke Skywalker"
+
+
+@pytest.mark.parametrize("expand", [False, True])
+def test_unknown_fields_are_rejected_in_both_modes(dataset, expand):
+    with pinned_dataset(dataset), pytest.raises(HTTPException) as error:
+        export_resource(Types.films, None, expand, ["title,bogus"])
+    assert error.value.status_code == 400
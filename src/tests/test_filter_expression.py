@@ -0,0 +1,68 @@
+import pytest
+from fastapi import HTTPException
+
+from utils.bitsets import iter_bits
+from utils.filter_expression import MAX_FILTER_DEPTH, filter_expression_bits, parse_filter
+
+
+def _rejected(expression: str) -> str:
+    with pytest.raises(HTTPException) as error:
+        parse_filter(expression)
+    assert error.value.status_code == 400
+    return error.value.detail
+
+
+def test_precedence_and_implicit_and():
+    assert parse_filter("gender:male height>180 OR NOT eye_color:blue") == (
+        "or", [
+            ("and", [("pred", "gender", ":", "male"), ("pred", "height", ">", "180")]),
+            ("not", ("pred", "eye_color", ":", "blue")),
+        ],
+    )
+
+
+def test_quoted_values_keep_spaces():
+    assert parse_filter('name:"Luke Skywalker"') == ("pred", "name", ":", "Luke Skywalker")
+
+
+def test_unterminated_quote_is_rejected():
+    assert "aspas" in _rejected('name:"luke')
+
+
+def test_deep_nesting_is_rejected_instead_of_overflowing():
+    nested = "(" * MAX_FILTER_DEPTH + "gender:male" + ")" * MAX_FILTER_DEPTH
+    assert parse_filter(nested) == ("pred", "gender", ":", "male")
+    _rejected("(" * 300 + "gender:male" + ")" * 300)
+
+
+def test_long_chains_do_not_recurse():
+    assert parse_filter("NOT " * 1201 + "gender:male") == ("not", ("pred", "gender", ":", "male"))
+    assert len(parse_filter(" AND ".join(["height>10"] * 3000))[1]) == 3000
+
+
+@pytest.mark.parametrize("expression", ["gender:male AND", "(gender:male", "AND x:1", "gender:male)"])
+def test_malformed_expressions_are_rejected(expression):
+    _rejected(expression)
+
+
+def _names(dataset, resource: str, expression: str) -> list[str]:
+    bits = filter_expression_bits(expression, resource, dataset, None)
+    return [dataset.cache[resource][i]["name"] for i in iter_bits(bits)]
+
+
+def test_relation_colon_matches_the_whole_name(dataset):
+    # Naboo Moon contém "naboo", mas só ~ é substring
+    assert _names(dataset, "people", "homeworld:naboo") == ["Padmé Amidala"]
+    assert _names(dataset, "people", 'homeworld:"Naboo Moon"') == ["Jar Jar Binks"]
+    assert _names(dataset, "people", "homeworld~naboo") == ["Padmé Amidala", "Jar Jar Binks"]
+
+
+def test_relation_paths_and_numeric_predicates(dataset):
+    assert _names(dataset, "people", "species.homeworld:naboo AND height>160") == ["Luke Skywalker", "Padmé Amidala"]
+    assert _names(dataset, "people", 'NOT films:"a new hope" gender:male') == ["Jar Jar Binks"]
+
+
+def test_parameter_filters_are_combined_with_the_expression(dataset):
+    bits = filter_expression_bits("gender:female", "people", dataset, {0, 1})
+    assert list(iter_bits(bits)) == [1]
+    assert filter_expression_bits(None, "people", dataset, {0, 1}) == {0, 1}
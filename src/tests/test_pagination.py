@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from tests.conftest import swapi_cache
+from utils.ordering import Ordering
+from utils.pagination import paginate
+
+
+def _request(cursor=None, order_by="name", order_dir="asc", page=1, page_size=2):
+    return SimpleNamespace(cursor=cursor, order_by=order_by, order_dir=order_dir, page=page, page_size=page_size)
+
+
+def _walk(ordering: Ordering, matched=None, **kwargs) -> list[str]:
+    names, cursor = [], None
+    while True:
+        total, page, cursor = paginate(ordering, matched, _request(cursor=cursor, **kwargs))
+        names += [item["name"] for item in page]
+        if cursor is None:
+            return names
+
+
+def test_cursor_walk_visits_every_record_once_in_order():
+    people = swapi_cache()["people"]
+    ordering = Ordering(people)
+
+    assert _walk(ordering) == sorted(person["name"] for person in people)
+    assert _walk(ordering, order_dir="desc") == sorted((person["name"] for person in people), reverse=True)
+
+
+def test_cursor_walk_respects_the_filtered_set():
+    ordering = Ordering(swapi_cache()["people"])
+    assert _walk(ordering, matched={0, 2, 4}, order_dir="desc") == ["R2-D2", "Padmé Amidala", "Luke Skywalker"]
+
+
+def test_cursor_resumes_after_its_key_when_the_record_is_gone():
+    people = swapi_cache()["people"]
+    total, page, cursor = paginate(Ordering(people), None, _request())
+    assert [item["name"] for item in page] == ["Jar Jar Binks", "Leia Organa"]
+
+    # reload sem a Leia: a próxima página começa no primeiro nome depois dela
+    reloaded = Ordering(tuple(person for person in people if person["name"] != "Leia Organa"))
+    total, page, _ = paginate(reloaded, None, _request(cursor=cursor))
+    assert [item["name"] for item in page] == ["Luke Skywalker", "Padmé Amidala"]
+
+
+def test_cursor_must_match_the_ordering():
+    ordering = Ordering(swapi_cache()["people"])
+    _, _, cursor = paginate(ordering, None, _request())
+
+    for request in (_request(cursor=cursor, order_dir="desc"), _request(cursor="não-é-cursor")):
+        with pytest.raises(HTTPException) as error:
+            paginate(ordering, None, request)
+        assert error.value.status_code == 400
@@ -0,0 +1,39 @@
+import pytest
+from fastapi import HTTPException
+
+from utils.relation_filters import relation_filter_ordinals
+
+
+def _names(dataset, resource: str, related: str, matched=None) -> list[str]:
+    ordinals = relation_filter_ordinals(dataset.graph, dataset.text_indexes.get, resource, related, matched)
+    key = "title" if resource == "films" else "name"
+    return [dataset.cache[resource][i][key] for i in sorted(ordinals)]
+
+
+def test_multi_hop_path_follows_reverse_adjacency(dataset):
+    # pessoas cuja espécie vive num planeta com "moon" no nome
+    assert _names(dataset, "people", "species.homeworld:moon") == ["Jar Jar Binks"]
+    assert _names(dataset, "films", "starships.pilots:luke") == ["A New Hope"]
+    assert _names(dataset, "planets", "residents.species:droid") == ["Tatooine"]
+
+
+def test_names_match_by_substring(dataset):
+    assert _names(dataset, "people", "species.homeworld:naboo") == [
+        "Luke Skywalker", "Leia Organa", "Padmé Amidala", "Jar Jar Binks",
+    ]
+
+
+def test_filters_separated_by_semicolon_are_intersected(dataset):
+    assert _names(dataset, "people", "films:phantom;species:human") == ["Padmé Amidala"]
+    assert _names(dataset, "people", "films:hope", matched={0, 3}) == ["Luke Skywalker"]
+
+
+def test_no_filter_keeps_the_current_selection(dataset):
+    assert relation_filter_ordinals(dataset.graph, dataset.text_indexes.get, "people", None, None) is None
+
+
+@pytest.mark.parametrize("related", ["species.pilots:luke", "vehicles:x", "films"])
+def test_invalid_paths_and_formats_are_rejected(dataset, related):
+    with pytest.raises(HTTPException) as error:
+        relation_filter_ordinals(dataset.graph, dataset.text_indexes.get, "planets", related, None)
+    assert error.value.status_code == 400
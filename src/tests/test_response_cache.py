@@ -0,0 +1,71 @@
+from fastapi import Response
+from pydantic import BaseModel
+
+from services.dataset import Dataset, pinned_dataset
+from services.response_cache import ResponseCache, _RESPONSES, cached_response, canonical_request, clear_response_cache
+
+
+def test_cache_is_bounded_by_total_bytes_in_lru_order():
+    cache = ResponseCache(max_bytes=10)
+    cache.set((1, "a"), b"aaaa")
+    cache.set((1, "b"), b"bbbb")
+    cache.get((1, "a"))  # "a" passa a ser o mais recente
+    cache.set((1, "c"), b"cccc")
+
+    assert cache.get((1, "b")) is None
+    assert cache.get((1, "a")) == b"aaaa"
+    assert cache.size == 8
+    assert cache.stats()["evictions"] == 1
+
+
+def test_bodies_larger_than_the_cache_are_not_stored():
+    cache = ResponseCache(max_bytes=4)
+    cache.set((1, "a"), b"12345")
+    assert cache.stats()["entries"] == 0
+
+
+def test_only_the_current_generation_survives_a_reload():
+    cache = ResponseCache(max_bytes=100)
+    cache.set((1, "a"), b"velho")
+    cache.set((2, "a"), b"novo")
+    cache.discard_generations_except(2)
+
+    assert cache.get((1, "a")) is None
+    assert cache.get((2, "a")) == b"novo"
+    assert cache.size == len(b"novo")
+
+
+class _Request(BaseModel):
+    name: str | None = None
+    cursor: str | None = None
+    page: int = 1
+
+
+def test_text_filters_are_case_insensitive_but_cursors_are_not():
+    assert canonical_request(_Request(name="LUKE")) == canonical_request(_Request(name="luke"))
+    assert canonical_request(_Request(cursor="AbC")) != canonical_request(_Request(cursor="abc"))
+
+
+def test_cached_handler_runs_once_per_request_and_generation():
+    calls = []
+
+    @cached_response
+    def handler(request: _Request):
+        calls.append(request.name)
+        return Response(content=f'{{"call":{len(calls)}}}'.encode())
+
+    first, second = Dataset({}, generation=101), Dataset({}, generation=102)
+    try:
+        with pinned_dataset(first):
+            assert handler(request=_Request(name="Luke")).body == b'{"call":1}'
+            assert handler(request=_Request(name="luke")).body == b'{"call":1}'
+
+        with pinned_dataset(second):
+            assert handler(request=_Request(name="luke")).body == b'{"call":2}'
+            clear_response_cache()
+        with pinned_dataset(first):
+            assert handler(request=_Request(name="luke")).body == b'{"call":3}'
+    finally:
+        _RESPONSES.discard_generations_except(-1)
+
+    assert len(calls) == 3
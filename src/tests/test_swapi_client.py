@@ -0,0 +1,182 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+
+from services.swapi_client import CircuitBreaker, SwapiClient, UpstreamUnavailable
+
+STUB_URL = "http://swapi.stub/api"
+
+
+def _client(handler, **kwargs) -> SwapiClient:
+    # stub local no lugar do swapi.dev: nenhuma requisição sai para a rede
+    kwargs.setdefault("backoff", 0)
+    return SwapiClient(base_url=STUB_URL, transport=httpx.MockTransport(handler), **kwargs)
+
+
+def _run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_requests_go_to_the_configured_base_url():
+    seen = []
+
+    def handler(request):
+        seen.append(str(request.url))
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        client = _client(handler)
+        await client.get("people/1/")
+        # urls vindas dos dados apontam para o swapi.dev e são reescritas para o stub
+        await client.get("https://swapi.dev/api/films/2/")
+        await client.aclose()
+
+    _run(scenario())
+    assert seen == [f"{STUB_URL}/people/1/", f"{STUB_URL}/films/2/"]
+
+
+def test_base_url_comes_from_the_environment():
+    env = {**os.environ, "SWAPI_BASE_URL": f"{STUB_URL}/"}
+    output = subprocess.run(
+        [sys.executable, "-c", "from services.swapi_client import SwapiClient; print(SwapiClient().base_url)"],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert output.stdout.strip() == STUB_URL
+
+
+def test_retries_server_errors_and_transport_failures():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        if len(calls) == 2:
+            raise httpx.ConnectError("conexão recusada", request=request)
+        return httpx.Response(200, json={"name": "Luke Skywalker"})
+
+    async def scenario():
+        client = _client(handler, retries=3)
+        response = await client.get("people/1/")
+        await client.aclose()
+        return client, response
+
+    client, response = _run(scenario())
+    assert response.json() == {"name": "Luke Skywalker"}
+    assert len(calls) == 3
+    assert client.breaker.state == "closed"
+
+
+def test_gives_up_after_the_configured_retries():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(500)
+
+    async def scenario():
+        client = _client(handler, retries=2)
+        try:
+            await client.get("people/1/")
+        finally:
+            await client.aclose()
+
+    with pytest.raises(UpstreamUnavailable):
+        _run(scenario())
+    assert len(calls) == 3
+
+
+def test_client_errors_are_not_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(404, json={"detail": "Not found"})
+
+    async def scenario():
+        client = _client(handler, retries=3)
+        response = await client.get("people/999/")
+        await client.aclose()
+        return response
+
+    assert _run(scenario()).status_code == 404
+    assert len(calls) == 1
+
+
+def test_open_breaker_fails_fast_without_calling_upstream():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        return httpx.Response(502)
+
+    async def scenario():
+        client = _client(handler, retries=0)
+        for _ in range(client.breaker.failure_threshold):
+            with pytest.raises(UpstreamUnavailable):
+                await client.get("people/1/")
+
+        assert client.breaker.state == "open"
+        with pytest.raises(UpstreamUnavailable, match="circuito aberto"):
+            await client.get("people/1/")
+        await client.aclose()
+
+    _run(scenario())
+    assert len(calls) == 5
+
+
+def test_half_open_lets_a_single_probe_through():
+    calls = []
+    release = asyncio.Event()
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await release.wait()
+        return httpx.Response(200, json={})
+
+    async def scenario():
+        client = _client(handler, retries=0)
+        client.breaker.failures = client.breaker.failure_threshold
+        client.breaker.opened_at = 0.0  # janela já vencida: half-open
+
+        probe = asyncio.create_task(client.get("people/1/"))
+        await asyncio.sleep(0)
+        try:
+            # enquanto o teste está em andamento as outras chamadas falham na hora
+            others = await asyncio.wait_for(asyncio.gather(
+                *(client.get("people/2/") for _ in range(3)),
+                return_exceptions=True,
+            ), timeout=1)
+        finally:
+            release.set()
+            response = await probe
+            await client.aclose()
+        return client, others, response
+
+    client, others, response = _run(scenario())
+    assert calls == ["/api/people/1/"]
+    assert all(isinstance(result, UpstreamUnavailable) for result in others)
+    assert response.status_code == 200
+    assert client.breaker.state == "closed"
+
+
+def test_failed_probe_reopens_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.opened_at -= 30
+
+    assert breaker.state == "half-open"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+
+from services import swapi_services
+from services.swapi_client import SwapiClient
+
+URL = "https://swapi.dev/api/people/99/"
+
+
+def test_concurrent_callers_share_one_fetch():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"name": "Luke"}
+
+    async def scenario():
+        return await asyncio.gather(*(swapi_services._single_flight("chave", fetch) for _ in range(50)))
+
+    assert asyncio.run(scenario()) == [{"name": "Luke"}] * 50
+    assert len(calls) == 1
+    assert swapi_services._IN_FLIGHT == {}
+
+
+def test_a_cancelled_caller_does_not_cancel_the_shared_fetch():
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def scenario():
+        impatient = asyncio.ensure_future(swapi_services._single_flight("chave", fetch))
+        patient = asyncio.ensure_future(swapi_services._single_flight("chave", fetch))
+        await asyncio.sleep(0)
+        impatient.cancel()
+        return await patient
+
+    assert asyncio.run(scenario()) == "ok"
+
+
+@pytest.fixture
+def stub_client(monkeypatch):
+    calls = []
+
+    async def handler(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"name": "Jek Porkins", "url": URL})
+
+    client = SwapiClient(base_url="http://swapi.stub/api", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(swapi_services, "get_swapi_client", lambda: client)
+    yield calls
+    swapi_services._URL_CACHE.pop(URL)
+
+
+def test_by_id_misses_hit_upstream_once_and_then_the_url_cache(stub_client):
+    async def scenario():
+        burst = await asyncio.gather(*(swapi_services.fetch_data_by_id("people", 99) for _ in range(20)))
+        again = await swapi_services.fetch_data_by_id("people", 99)
+        return burst, again
+
+    burst, again = asyncio.run(scenario())
+    assert {record["name"] for record in burst} == {"Jek Porkins"}
+    assert again["name"] == "Jek Porkins"
+    assert stub_client == ["http://swapi.stub/api/people/99/"]
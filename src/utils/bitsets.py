@@ -0,0 +1,35 @@
+from itertools import compress
+
+# bitsets como int do python: o bit i ligado quer dizer que o ordinal i está no conjunto.
+# AND/OR/NOT e popcount (int.bit_count) rodam em C sobre o inteiro todo. Onde é
+# preciso testar registro a registro (itertools.compress, páginas) o bitset vira
+# uma máscara com um byte 0/1 por registro; as duas conversões são lineares e em C
+_TO_MASK = bytes.maketrans(b"01", b"\x00\x01")
+_FROM_MASK = bytes.maketrans(b"\x00\x01", b"01")
+
+
+def from_mask(mask: bytes) -> int:
+    if not mask:
+        return 0
+    return int(bytes(mask).translate(_FROM_MASK)[::-1], 2)
+
+
+def to_mask(bits: int, size: int) -> bytes:
+    # bin() começa pelo bit mais alto: invertido, o caractere i é o bit i
+    return bin(bits)[:1:-1].encode().translate(_TO_MASK).ljust(size, b"\x00")[:size]
+
+
+def from_ordinals(ordinals, size: int) -> int:
+    mask = bytearray(size)
+    for i in ordinals:
+        mask[i] = 1
+    return from_mask(mask)
+
+
+def all_bits(size: int) -> int:
+    return (1 << size) - 1
+
+
+def iter_bits(bits: int):
+    mask = to_mask(bits, bits.bit_length())
+    return compress(range(len(mask)), mask)
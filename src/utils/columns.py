@@ -0,0 +1,176 @@
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+
+from utils.bitsets import from_mask, to_mask
+
+# campos numéricos que o swapi entrega como string ("unknown", "n/a", "1,358"...)
+NUMERIC_FIELDS: dict[str, tuple[str, ...]] = {
+    "people": ("height", "mass"),
+    "planets": ("rotation_period", "orbital_period", "diameter", "surface_water", "population"),
+    "films": ("episode_id",),
+    "species": ("average_height", "average_lifespan"),
+    "starships": (
+        "cost_in_credits", "length", "max_atmosphering_speed", "crew",
+        "passengers", "cargo_capacity", "hyperdrive_rating", "MGLT",
+    ),
+    "vehicles": (
+        "cost_in_credits", "length", "max_atmosphering_speed", "crew",
+        "passengers", "cargo_capacity",
+    ),
+}
+
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+
+
+def parse_number(value) -> int | float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if not isinstance(value, str):
+        return None
+
+    value = value.replace(",", "").strip()
+    if not _NUMBER.fullmatch(value):
+        return None
+    return float(value) if "." in value else int(value)
+
+
+class ColumnStats:
+
+    def __init__(self, values: array):
+        self.count = len(values)
+        self.total = sum(values)
+        self.min = min(values) if values else 0
+        self.max = max(values) if values else 0
+        self.avg = self.total / self.count if self.count else 0
+
+
+# coluna tipada de um campo numérico: array('q') quando todos os valores
+# conhecidos são inteiros, array('d') caso contrário; mask[i] == 1 quando o
+# registro i tem valor conhecido. Os seletores são bitsets (utils/bitsets.py)
+class NumericColumn:
+
+    def __init__(self, raw_values: list):
+        parsed = [parse_number(value) for value in raw_values]
+        integral = all(isinstance(value, int) for value in parsed if value is not None)
+
+        self.typecode = "q" if integral else "d"
+        self.values = array(self.typecode, (0 if value is None else value for value in parsed))
+        self.mask = bytes(value is not None for value in parsed)
+        self.known_bits = from_mask(self.mask)
+
+        # ordinais com valor conhecido ordenados pelo valor, para busca binária nas faixas
+        self.sorted_ordinals = array("l", sorted(
+            compress(range(len(parsed)), self.mask),
+            key=self.values.__getitem__
+        ))
+        self.sorted_values = array(self.typecode, (self.values[i] for i in self.sorted_ordinals))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def get(self, ordinal: int) -> int | float | None:
+        return self.values[ordinal] if self.mask[ordinal] else None
+
+    def selection(self, selector: int | None = None) -> bytes:
+        if selector is None:
+            return self.mask
+        return to_mask(self.known_bits & selector, len(self.values))
+
+    def known(self, selector: int | None = None) -> array:
+        return array(self.typecode, compress(self.values, self.selection(selector)))
+
+    def stats(self, selector: int | None = None) -> ColumnStats:
+        return ColumnStats(self.known(selector))
+
+    def argmax(self, selector: int | None = None) -> int | None:
+        # primeiro registro com o maior valor conhecido
+        ordinals = list(compress(range(len(self.values)), self.selection(selector)))
+        if not ordinals:
+            return None
+        return max(ordinals, key=self.values.__getitem__)
+
+    def range_ordinals(self, low=None, high=None) -> set[int]:
+        start = 0 if low is None else bisect_left(self.sorted_values, low)
+        end = len(self.sorted_values) if high is None else bisect_right(self.sorted_values, high)
+        return set(self.sorted_ordinals[start:end])
+
+    def compare(self, op: str, value) -> array:
+        # ordinais com valor conhecido que satisfazem `valor <op> value`
+        if op == ">":
+            return self.sorted_ordinals[bisect_right(self.sorted_values, value):]
+        if op == ">=":
+            return self.sorted_ordinals[bisect_left(self.sorted_values, value):]
+        if op == "<":
+            return self.sorted_ordinals[:bisect_left(self.sorted_values, value)]
+        if op == "<=":
+            return self.sorted_ordinals[:bisect_right(self.sorted_values, value)]
+        return self.sorted_ordinals[
+            bisect_left(self.sorted_values, value):bisect_right(self.sorted_values, value)
+        ]
+
+
+def range_filter_ordinals(columns: dict[str, NumericColumn], request, matched: set[int] | None) -> set[int] | None:
+    # aplica os min_<campo>/max_<campo> do request; cada limite custa O(log n)
+    for field, column in columns.items():
+        low = getattr(request, f"min_{field}", None)
+        high = getattr(request, f"max_{field}", None)
+        if low is None and high is None:
+            continue
+
+        in_range = column.range_ordinals(low, high)
+        matched = in_range if matched is None else matched & in_range
+
+    return matched
+
+
+def top_record(items: tuple[dict, ...], column: NumericColumn, field: str) -> dict | None:
+    # registro com o maior valor positivo da coluna, no formato das rotas de stats
+    ordinal = column.argmax()
+    if ordinal is None or column.values[ordinal] <= 0:
+        return None
+    return {"name": items[ordinal]["name"], field: column.values[ordinal]}
+
+
+def percentile(sorted_values: list, p: float) -> float | None:
+    # interpolação linear entre os vizinhos mais próximos
+    if not sorted_values:
+        return None
+    k = (len(sorted_values) - 1) * p / 100
+    lower = math.floor(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+def aggregate(column: NumericColumn, groups: list | None, percentiles: list[float]) -> dict:
+    # uma única passada pelos ordinais já ordenados por valor: cada grupo
+    # recebe seus valores em ordem e os percentis saem sem ordenar de novo
+    buckets: dict = {}
+    for i in column.sorted_ordinals:
+        key = None if groups is None else groups[i]
+        buckets.setdefault(key, []).append(column.values[i])
+
+    return {
+        key: {
+            "count": len(values),
+            "min": values[0],
+            "max": values[-1],
+            "avg": sum(values) / len(values),
+            "percentiles": {f"p{p:g}": percentile(values, p) for p in percentiles},
+        }
+        for key, values in buckets.items()
+    }
+
+
+def build_numeric_columns(cache: dict[str, tuple[dict, ...]]) -> dict[str, dict[str, NumericColumn]]:
+    return {
+        resource: {
+            field: NumericColumn([item.get(field) for item in items])
+            for field in NUMERIC_FIELDS.get(resource, ())
+        }
+        for resource, items in cache.items()
+    }
@@ -0,0 +1,55 @@
+import hashlib
+import os
+
+# max-age enviado no Cache-Control das rotas de dados (segundos)
+HTTP_CACHE_MAX_AGE = int(os.getenv("HTTP_CACHE_MAX_AGE", "300"))
+
+# revisão do serviço (o Cloud Run define K_REVISION): um deploy novo pode mudar
+# o formato das respostas mesmo com os mesmos dados
+APP_REVISION = os.getenv("APP_REVISION") or os.getenv("K_REVISION", "")
+
+# rotas cujo conteúdo não depende só do dataset
+UNCACHEABLE_PREFIXES = ("/admin", "/metrics", "/docs", "/redoc", "/openapi.json")
+
+# by-id e batch buscam no swapi o que não está no dataset (via _URL_CACHE): o
+# corpo pode mudar dentro da mesma geração e pode trazer erros por item
+UPSTREAM_SEGMENTS = {"by-id", "batch"}
+
+
+def is_cacheable(method: str, path: str) -> bool:
+    return (
+        method == "GET"
+        and not path.startswith(UNCACHEABLE_PREFIXES)
+        and UPSTREAM_SEGMENTS.isdisjoint(path.split("/"))
+    )
+
+
+def normalized_query(query_items: list[tuple[str, str]]) -> str:
+    # a ordem dos parâmetros não muda a resposta
+    return "&".join(f"{key}={value}" for key, value in sorted(query_items))
+
+
+def etag_for(fingerprint: str, path: str, query_items: list[tuple[str, str]]) -> str:
+    # conteúdo do dataset + revisão do código + rota: instâncias diferentes (ou um
+    # cold start) só geram o mesmo ETag quando responderiam o mesmo corpo
+    digest = hashlib.blake2b(
+        f"{APP_REVISION}|{path}?{normalized_query(query_items)}".encode(),
+        digest_size=12,
+    ).hexdigest()
+    return f'"{fingerprint}-{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    # If-None-Match usa comparação fraca: W/"x" casa com "x"
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def cache_control() -> str:
+    return f"public, max-age={HTTP_CACHE_MAX_AGE}"
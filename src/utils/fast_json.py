@@ -0,0 +1,25 @@
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+# dados do cache já são confiáveis: vão direto para o orjson, sem passar pelo
+# jsonable_encoder nem pela validação do response_model
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj):
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"tipo não serializável: {type(obj).__name__}")
+
+
+def dumps(obj) -> bytes:
+    return orjson.dumps(obj, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+
+    def render(self, content) -> bytes:
+        return dumps(content)
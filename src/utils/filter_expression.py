@@ -0,0 +1,200 @@
+import re
+
+from fastapi import HTTPException
+
+from services.dataset import Dataset
+from services.relations import RELATION_FIELDS
+from utils.bitsets import all_bits, from_ordinals
+from utils.columns import parse_number
+from utils.filters import exact_ordinals
+from utils.relation_filters import related_ordinals
+
+# expressões de filtro das listagens, ex.:
+#   filter=gender:male AND height>180
+#   filter=(climate~arid OR climate~temperate) AND NOT population<1000000
+#   filter=species.homeworld~tatooine
+# campo:valor é igualdade (sem diferenciar maiúsculas; gender:others como no
+# parâmetro gender), campo~valor é substring, > >= < <= = comparam números e
+# != nega a igualdade; um campo de relação (com ou sem caminho) casa pelo nome
+# do registro relacionado, inteiro com : e por substring com ~. Cada predicado
+# vira um bitset sobre os ordinais do recurso e AND/OR/NOT são operações de bits
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<paren>[()])
+      | (?P<keyword>(?i:AND|OR|NOT))(?=[\s()]|$)
+      | (?P<field>[A-Za-z_][\w.]*)\s*(?P<op>>=|<=|!=|>|<|=|:|~)\s*
+        (?P<value>"(?:[^"\\]|\\.)*"|[^\s()"]+)
+    )""",
+    re.VERBOSE,
+)
+
+# limite de parênteses aninhados: o parser e a avaliação são recursivos
+MAX_FILTER_DEPTH = 32
+
+
+def _tokenize(expression: str) -> list[tuple]:
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            rest = expression[position:]
+            if '"' in rest.split(None, 1)[0]:
+                raise HTTPException(status_code=400, detail=f"filter inválido: aspas sem fechar em {rest[:30]!r}")
+            raise HTTPException(status_code=400, detail=f"filter inválido perto de: {rest[:30]!r}")
+
+        if match["paren"]:
+            tokens.append(("paren", match["paren"]))
+        elif match["keyword"]:
+            tokens.append(("keyword", match["keyword"].upper()))
+        else:
+            value = match["value"]
+            if value.startswith('"'):
+                value = re.sub(r"\\(.)", r"\1", value[1:-1])
+            tokens.append(("pred", match["field"], match["op"], value))
+        position = match.end()
+
+    return tokens
+
+
+class _Parser:
+
+    def __init__(self, tokens: list[tuple]):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self) -> tuple | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self) -> tuple:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def parse(self):
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise HTTPException(status_code=400, detail="filter inválido: sobrou expressão sem operador")
+        return node
+
+    # AND/OR viram nós n-ários: uma cadeia longa não aprofunda a árvore
+    def parse_or(self):
+        nodes = [self.parse_and()]
+        while self.peek() == ("keyword", "OR"):
+            self.take()
+            nodes.append(self.parse_and())
+        return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+    def parse_and(self):
+        nodes = [self.parse_not()]
+        while True:
+            token = self.peek()
+            if token == ("keyword", "AND"):
+                self.take()
+            elif token is None or token in (("keyword", "OR"), ("paren", ")")):
+                return nodes[0] if len(nodes) == 1 else ("and", nodes)
+            # predicados lado a lado valem como AND
+            nodes.append(self.parse_not())
+
+    def parse_not(self):
+        # NOT NOT NOT ... é contado num laço, sem recursão
+        negated = False
+        while self.peek() == ("keyword", "NOT"):
+            self.take()
+            negated = not negated
+        node = self.parse_atom()
+        return ("not", node) if negated else node
+
+    def parse_atom(self):
+        token = self.take()
+        if token is None:
+            raise HTTPException(status_code=400, detail="filter inválido: expressão incompleta")
+
+        if token == ("paren", "("):
+            self.depth += 1
+            if self.depth > MAX_FILTER_DEPTH:
+                raise HTTPException(status_code=400, detail=f"filter inválido: mais de {MAX_FILTER_DEPTH} parênteses aninhados")
+            node = self.parse_or()
+            self.depth -= 1
+            if self.take() != ("paren", ")"):
+                raise HTTPException(status_code=400, detail="filter inválido: parêntese sem fechar")
+            return node
+
+        if token[0] != "pred":
+            raise HTTPException(status_code=400, detail=f"filter inválido perto de {token[1]!r}")
+        return token
+
+
+def parse_filter(expression: str):
+    return _Parser(_tokenize(expression)).parse()
+
+
+def _predicate_bits(dataset: Dataset, resource: str, field: str, op: str, value: str) -> int:
+    path = tuple(field.split("."))
+    index = dataset.text_indexes[resource]
+    columns = dataset.numeric_columns.get(resource, {})
+    size = len(dataset.cache[resource])
+
+    if path[0] in RELATION_FIELDS.get(resource, {}):
+        if op not in (":", "~"):
+            raise HTTPException(status_code=400, detail=f"relação {field} aceita apenas : ou ~")
+        return from_ordinals(related_ordinals(
+            dataset.graph, dataset.text_indexes.get, resource, path, value.lower(), exact=op == ":"
+        ), size)
+
+    if len(path) > 1 or (field not in index.values and field not in columns):
+        raise HTTPException(status_code=400, detail=f"campo desconhecido em filter: {field}")
+
+    if op in (">", ">=", "<", "<=", "="):
+        number = parse_number(value)
+        if field not in columns or number is None:
+            raise HTTPException(status_code=400, detail=f"{field}{op}{value}: comparação exige campo e valor numéricos")
+        return from_ordinals(columns[field].compare(op, number), size)
+
+    if op == "~":
+        return from_ordinals(index.contains(field, value.lower()), size)
+
+    bits = from_ordinals(exact_ordinals(index, field, value.lower()), size)
+    if op == "!=":
+        return all_bits(size) & ~bits
+    return bits
+
+
+def _evaluate(node, dataset: Dataset, resource: str) -> int:
+    kind = node[0]
+    if kind == "and":
+        bits = -1
+        for child in node[1]:
+            bits &= _evaluate(child, dataset, resource)
+            if not bits:
+                break
+        return bits
+    if kind == "or":
+        bits = 0
+        for child in node[1]:
+            bits |= _evaluate(child, dataset, resource)
+        return bits
+    if kind == "not":
+        return all_bits(len(dataset.cache[resource])) & ~_evaluate(node[1], dataset, resource)
+    return _predicate_bits(dataset, resource, *node[1:])
+
+
+def filter_expression_bits(
+    expression: str | None,
+    resource: str,
+    dataset: Dataset,
+    matched: set[int] | None,
+) -> set[int] | int | None:
+    # junta os filtros por parâmetro (matched) com a expressão; com expressão o
+    # resultado é um bitset e o total da listagem sai de um popcount, sem ela
+    # matched segue como está
+    if not expression or not expression.strip():
+        return matched
+
+    bits = _evaluate(parse_filter(expression), dataset, resource)
+    if matched is not None:
+        bits &= from_ordinals(matched, len(dataset.cache[resource]))
+    return bits
@@ -1,7 +1,20 @@
 import requests
 
+from utils.text_index import TextIndex, intersect
+
+
+def _use_index(data, index: TextIndex | None) -> bool:
+    # o índice só vale para a lista exata a partir da qual foi montado
+    return index is not None and index.items is data
+
+
+def apply_filters(data, filters, index: TextIndex | None = None):
+    if _use_index(data, index) and filters:
+        return index.select(intersect([
+            index.contains(key, value.lower())
+            for key, value in filters.items()
+        ]))
 
-def apply_filters(data, filters):
     for key, value in filters.items():
         data = [
             item for item in data
@@ -10,7 +23,13 @@ def apply_filters(data, filters):
     return data
 
 
-def apply_exact_filters(data, filters):
+def apply_exact_filters(data, filters, index: TextIndex | None = None):
+    if _use_index(data, index) and filters:
+        return index.select(intersect([
+            index.exact(key, str(value).lower())
+            for key, value in filters.items()
+        ]))
+
     for key, value in filters.items():
         data = [
             item for item in data
@@ -18,38 +37,34 @@ def apply_exact_filters(data, filters):
         ]
     return data
 
-def filter_no_gender(data):
-    return [
-        person for person in data
-        if person.get("gender", "").lower() not in ("male", "female")
-    ]
-
 EXACT_FIELDS = {"gender", "birth_year"}
 
-def apply_smart_filters(data, filters):
-    
+def exact_ordinals(index: TextIndex, key: str, value: str) -> set[int]:
+    # gender=others são os registros que não são male nem female
+    if key == "gender" and value == "others":
+        return index.exclude("gender", ("male", "female"))
+    return index.exact(key, value)
+
+
+def smart_filter_ordinals(index: TextIndex, filters) -> set[int] | None:
+    postings = []
+
     for key, value in filters.items():
         if value is None:
             continue
 
         value = str(value).lower()
 
-        if key == "gender" and value == "others":
-            data = filter_no_gender(data)
-            continue
-        
         if key in EXACT_FIELDS:
-            data = [
-                item for item in data
-                if str(item.get(key, "")).lower() == value
-            ]
+            postings.append(exact_ordinals(index, key, value))
         else:
-            data = [
-                item for item in data
-                if value in str(item.get(key, "")).lower()
-            ]
+            postings.append(index.contains(key, value))
 
-    return data
+    # None indica que nenhum filtro foi aplicado (todos os registros)
+    if not postings:
+        return None
+
+    return intersect(postings)
 
 
 def safe_int(value):
@@ -0,0 +1,132 @@
+from typing import Callable
+
+from services.relations import extract_id_from_url
+from utils.bitsets import from_ordinals, to_mask
+
+
+def item_id(item: dict) -> int:
+    return extract_id_from_url(item.get("url"))
+
+
+def _sort_key(items: tuple[dict, ...], field: str):
+    if field == "url":
+        return item_id
+
+    values = [item.get(field) for item in items]
+    if values and all(isinstance(value, int) for value in values):
+        return lambda item: item.get(field)
+
+    return lambda item: str(item.get(field) or "").lower()
+
+
+def _original_order(item: dict) -> str:
+    return ""
+
+
+# permutações (ordinais) já ordenadas por cada campo de um recurso, asc e desc,
+# montadas no load_swapi_cache; as listagens percorrem a permutação em vez de ordenar
+class Ordering:
+
+    def __init__(self, items: tuple[dict, ...]):
+        self.items = items
+        self.identity: tuple[int, ...] = tuple(range(len(items)))
+        self.ordinals_by_id: dict[int, int] = {
+            item_id(item): ordinal for ordinal, item in enumerate(items)
+        }
+        self.keys: dict[str, Callable[[dict], object]] = {}
+        self.permutations: dict[tuple[str, bool], tuple[int, ...]] = {}
+        # positions[(campo, desc)][ordinal] -> posição do registro na permutação
+        self.positions: dict[tuple[str, bool], list[int]] = {}
+
+        fields = {
+            field
+            for item in items
+            for field, value in item.items()
+            if not isinstance(value, (list, dict))
+        }
+
+        for field in fields:
+            key = _sort_key(items, field)
+            self.keys[field] = key
+
+            for desc in (False, True):
+                permutation = tuple(sorted(
+                    self.identity,
+                    key=lambda i: key(items[i]),
+                    reverse=desc
+                ))
+                positions = [0] * len(items)
+                for position, ordinal in enumerate(permutation):
+                    positions[ordinal] = position
+
+                self.permutations[(field, desc)] = permutation
+                self.positions[(field, desc)] = positions
+
+    def permutation(self, order_by: str | None, order_dir: str | None) -> tuple[int, ...]:
+        # campo desconhecido mantém a ordem original, como o sort estável fazia
+        return self.permutations.get((order_by, order_dir == "desc"), self.identity)
+
+    def sort_key(self, order_by: str | None, item: dict):
+        return self.keys.get(order_by, _original_order)(item)
+
+    def position_after(self, order_by: str | None, order_dir: str | None, key, id: int) -> int | None:
+        # posição, na permutação, do último registro entregue pelo cursor
+        desc = order_dir == "desc"
+        ordinal = self.ordinals_by_id.get(id)
+
+        if ordinal is not None and self.sort_key(order_by, self.items[ordinal]) == key:
+            positions = self.positions.get((order_by, desc))
+            return positions[ordinal] if positions else ordinal
+
+        # o registro não existe mais: retoma do primeiro registro depois da chave
+        permutation = self.permutation(order_by, order_dir)
+        try:
+            for position, ordinal in enumerate(permutation):
+                current = self.sort_key(order_by, self.items[ordinal])
+                if (current < key) if desc else (current > key):
+                    return position - 1
+        except TypeError:
+            return None
+        return len(permutation) - 1
+
+    def page(
+        self,
+        matched: set[int] | int | None,
+        order_by: str | None,
+        order_dir: str | None,
+        start: int,
+        limit: int,
+        after: int = -1,
+    ) -> tuple[int, list[dict], bool]:
+        permutation = self.permutation(order_by, order_dir)
+        begin = after + 1
+
+        if matched is None:
+            first = begin + start
+            page = [self.items[i] for i in permutation[first:first + limit]]
+            return len(permutation), page, first + limit < len(permutation)
+
+        # matched pode vir como conjunto de ordinais ou como bitset (int)
+        if not isinstance(matched, int):
+            matched = from_ordinals(matched, len(self.items))
+        total = matched.bit_count()
+        bitmap = to_mask(matched, len(self.items))
+
+        page: list[dict] = []
+        skipped = 0
+        for position in range(begin, len(permutation)):
+            i = permutation[position]
+            if not bitmap[i]:
+                continue
+            if skipped < start:
+                skipped += 1
+                continue
+            if len(page) == limit:
+                return total, page, True
+            page.append(self.items[i])
+
+        return total, page, False
+
+
+def build_orderings(cache: dict[str, tuple[dict, ...]]) -> dict[str, Ordering]:
+    return {resource: Ordering(items) for resource, items in cache.items()}
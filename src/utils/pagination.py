@@ -0,0 +1,61 @@
+import base64
+import json
+
+from fastapi import HTTPException
+
+from utils.ordering import Ordering, item_id
+
+# limite de page_size das listagens; o cursor permite percorrer tudo em lotes grandes
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(order_by: str | None, order_dir: str | None, key, id: int) -> str:
+    raw = json.dumps([order_by, order_dir == "desc", key, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str | None, bool, object, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        order_by, desc, key, id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="cursor inválido")
+
+    if not isinstance(id, int) or not isinstance(desc, bool):
+        raise HTTPException(status_code=400, detail="cursor inválido")
+
+    return order_by, desc, key, id
+
+
+def paginate(ordering: Ordering, matched: set[int] | int | None, request) -> tuple[int, list[dict], str | None]:
+    after = -1
+    start = (request.page - 1) * request.page_size
+
+    if request.cursor:
+        order_by, desc, key, id = decode_cursor(request.cursor)
+        if order_by != request.order_by or desc != (request.order_dir == "desc"):
+            raise HTTPException(status_code=400, detail="cursor não corresponde ao order_by/order_dir")
+
+        position = ordering.position_after(request.order_by, request.order_dir, key, id)
+        if position is None:
+            raise HTTPException(status_code=400, detail="cursor inválido")
+
+        # no modo cursor a página é ignorada: continua logo depois do último registro
+        after = position
+        start = 0
+
+    total, page, has_more = ordering.page(
+        matched, request.order_by, request.order_dir, start, request.page_size, after
+    )
+
+    next_cursor = None
+    if has_more and page:
+        last = page[-1]
+        next_cursor = encode_cursor(
+            request.order_by,
+            request.order_dir,
+            ordering.sort_key(request.order_by, last),
+            item_id(last),
+        )
+
+    return total, page, next_cursor
@@ -0,0 +1,21 @@
+# fields=a,b; o export, que declara fields como lista, aceita também fields=a&fields=b
+def parse_fields(fields: str | list[str] | None) -> set[str] | None:
+    if not fields:
+        return None
+    if isinstance(fields, str):
+        fields = [fields]
+    parsed = {field.strip() for value in fields for field in value.split(",") if field.strip()}
+    return parsed or None
+
+
+def project(item: dict, fields: set[str] | None) -> dict:
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
+
+
+def parse_expand(expand: str | None) -> set[str] | None:
+    # sem expand todas as relações são expandidas; expand=none não expande nenhuma
+    if expand is not None and expand.strip().lower() == "none":
+        return set()
+    return parse_fields(expand)
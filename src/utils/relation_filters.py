@@ -0,0 +1,60 @@
+from typing import Callable
+
+from fastapi import HTTPException
+
+from services.relations import RelationGraph, resource_chain
+from utils.text_index import TextIndex
+
+# filtro por relação: related=<caminho>:<nome>, ex. related=species.homeworld:tatooine
+# (pessoas cuja espécie vive em Tatooine); vários filtros separados por ";" valem juntos
+
+
+def _name_field(resource: str) -> str:
+    return "title" if resource == "films" else "name"
+
+
+def parse_relation_filters(value: str | None) -> list[tuple[tuple[str, ...], str]]:
+    if not value:
+        return []
+
+    parsed = []
+    for part in value.split(";"):
+        path, sep, name = part.partition(":")
+        if not sep or not path.strip() or not name.strip():
+            raise HTTPException(status_code=400, detail="related deve ter o formato caminho:nome (ex.: films.characters:luke)")
+        parsed.append((tuple(field.strip() for field in path.split(".")), name.strip().lower()))
+    return parsed
+
+
+def related_ordinals(
+    graph: RelationGraph,
+    text_index: Callable[[str], TextIndex],
+    resource: str,
+    path: tuple[str, ...],
+    name: str,
+    exact: bool = False,
+) -> set[int]:
+    try:
+        target = resource_chain(resource, path)[-1]
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    # nome resolvido no índice de texto do recurso final (substring, ou nome
+    # inteiro com exact); daí para trás só listas reversas
+    index = text_index(target)
+    lookup = index.exact if exact else index.contains
+    targets = [index.items[i] for i in lookup(_name_field(target), name)]
+    return graph.referencing(resource, path, targets)
+
+
+def relation_filter_ordinals(
+    graph: RelationGraph,
+    text_index: Callable[[str], TextIndex],
+    resource: str,
+    value: str | None,
+    matched: set[int] | None,
+) -> set[int] | None:
+    for path, name in parse_relation_filters(value):
+        related = related_ordinals(graph, text_index, resource, path, name)
+        matched = related if matched is None else matched & related
+    return matched
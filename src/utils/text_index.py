@@ -0,0 +1,79 @@
+NGRAM_SIZE = 3
+
+
+def _ngrams(value: str) -> set[str]:
+    return {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+# índice invertido de um recurso, montado no load_swapi_cache.
+# values[campo][valor em minúsculo] -> ordinais dos registros com aquele valor
+# ngrams[campo][trigrama] -> valores distintos do campo que contêm o trigrama
+class TextIndex:
+
+    def __init__(self, items: list[dict]):
+        self.items = items
+        self.all: set[int] = set(range(len(items)))
+        self.values: dict[str, dict[str, set[int]]] = {}
+        self.ngrams: dict[str, dict[str, set[str]]] = {}
+
+        for ordinal, item in enumerate(items):
+            for field, value in item.items():
+                if isinstance(value, (list, dict)):
+                    continue
+                value = str(value).lower()
+                self.values.setdefault(field, {}).setdefault(value, set()).add(ordinal)
+
+        for field, postings in self.values.items():
+            grams = self.ngrams.setdefault(field, {})
+            for value in postings:
+                for gram in _ngrams(value):
+                    grams.setdefault(gram, set()).add(value)
+
+    def exact(self, field: str, value: str) -> set[int]:
+        return self.values.get(field, {}).get(value, set())
+
+    def exclude(self, field: str, values: tuple[str, ...]) -> set[int]:
+        postings = self.values.get(field, {})
+        excluded = set()
+        for value in values:
+            excluded |= postings.get(value, set())
+        return self.all - excluded
+
+    def contains(self, field: str, value: str) -> set[int]:
+        if not value:
+            return self.all
+
+        postings = self.values.get(field, {})
+
+        if len(value) < NGRAM_SIZE:
+            candidates = postings.keys()
+        else:
+            grams = self.ngrams.get(field, {})
+            candidates = intersect([grams.get(gram, set()) for gram in _ngrams(value)])
+
+        # os trigramas só garantem candidatos; a substring é confirmada no valor
+        result: set[int] = set()
+        for candidate in candidates:
+            if value in candidate:
+                result |= postings[candidate]
+        return result
+
+    def select(self, ordinals: set[int]) -> list[dict]:
+        return [self.items[i] for i in sorted(ordinals)]
+
+
+def intersect(postings: list[set]) -> set:
+    if not postings:
+        return set()
+
+    postings = sorted(postings, key=len)
+    result = set(postings[0])
+    for posting in postings[1:]:
+        if not result:
+            break
+        result &= posting
+    return result
+
+
+def build_text_indexes(cache: dict[str, list[dict]]) -> dict[str, TextIndex]:
+    return {resource: TextIndex(items) for resource, items in cache.items()}